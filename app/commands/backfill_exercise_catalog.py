@@ -0,0 +1,135 @@
+"""
+Links workout and template exercises created before the exercise catalog
+existed to catalog entries, creating one per distinct normalized name.
+
+    python -m app.commands.backfill_exercise_catalog [--batch-size 500]
+
+Safe to run while the app is serving traffic and to re-run: each batch is
+its own transaction and only rows with exercise_id IS NULL are touched.
+Users whose workout exercises got linked then have their workout rollups
+rebuilt, since per-exercise rollups skip unlinked rows. Before the rollup
+tables exist that step is skipped: the migrations that add them backfill
+from the linked rows.
+"""
+import argparse
+import asyncio
+from collections import defaultdict
+
+from sqlalchemy import bindparam, inspect, select, update
+
+from app.core.db import AsyncSessionLocal, engine
+from app.core.exercise_catalog import resolve_exercise_ids
+from app.core.workout_stats import rebuild_user
+from app.models.exercise_session_summary import ExerciseSessionSummary
+from app.models.user_exercise_stats import UserExerciseStats
+from app.models.workout_daily_stats import WorkoutDailyExerciseStats, WorkoutDailyStats
+from app.models.workout_exercise import WorkoutExercise
+from app.models.workout_template import WorkoutTemplate
+from app.models.workout_template_exercise import WorkoutTemplateExercise
+
+workout_exercises = WorkoutExercise.__table__
+template_exercises = WorkoutTemplateExercise.__table__
+_rollup_tables = {
+    t.__tablename__ for t in (WorkoutDailyStats, WorkoutDailyExerciseStats, UserExerciseStats, ExerciseSessionSummary)
+}
+
+_link_workout_exercises = (
+    update(workout_exercises)
+    .where(
+        workout_exercises.c.user_id == bindparam("b_user_id"),
+        workout_exercises.c.name == bindparam("b_name"),
+        workout_exercises.c.exercise_id.is_(None),
+    )
+    .values(exercise_id=bindparam("b_exercise_id"))
+)
+
+_link_template_exercises = (
+    update(template_exercises)
+    .where(
+        template_exercises.c.template_id.in_(
+            select(WorkoutTemplate.id).where(WorkoutTemplate.user_id == bindparam("b_user_id"))
+        ),
+        template_exercises.c.name == bindparam("b_name"),
+        template_exercises.c.exercise_id.is_(None),
+    )
+    .values(exercise_id=bindparam("b_exercise_id"))
+)
+
+
+async def _backfill(pending_names, link_statement, batch_size: int) -> set[int]:
+    """Links every pending name and returns the ids of the users touched."""
+    linked = 0
+    user_ids: set[int] = set()
+    while True:
+        async with AsyncSessionLocal() as db:
+            res = await db.execute(pending_names.limit(batch_size))
+            names_by_user: dict[int, list[str]] = defaultdict(list)
+            for user_id, name in res.all():
+                names_by_user[user_id].append(name)
+            if not names_by_user:
+                return user_ids
+
+            params = []
+            for user_id, names in names_by_user.items():
+                ids = await resolve_exercise_ids(db, user_id, names)
+                params.extend(
+                    {"b_user_id": user_id, "b_name": name, "b_exercise_id": exercise_id}
+                    for name, exercise_id in ids.items()
+                )
+            await db.execute(link_statement, params)
+            await db.commit()
+
+        linked += len(params)
+        user_ids.update(names_by_user)
+        print(f"  linked {linked} names")
+
+
+async def _rebuild_rollups(user_ids: set[int]) -> None:
+    async with engine.connect() as conn:
+        tables = set(await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()))
+    if not _rollup_tables <= tables:
+        print("rollup tables not migrated yet, skipping rebuild")
+        return
+
+    print(f"rebuilding workout rollups for {len(user_ids)} users")
+    for user_id in sorted(user_ids):
+        async with AsyncSessionLocal() as db:
+            await rebuild_user(db, user_id)
+            await db.commit()
+
+
+async def backfill_exercise_catalog(batch_size: int) -> None:
+    try:
+        print("workout exercises")
+        user_ids = await _backfill(
+            select(WorkoutExercise.user_id, WorkoutExercise.name)
+            .where(WorkoutExercise.exercise_id.is_(None))
+            .distinct(),
+            _link_workout_exercises,
+            batch_size,
+        )
+
+        print("template exercises")
+        await _backfill(
+            select(WorkoutTemplate.user_id, WorkoutTemplateExercise.name)
+            .join(WorkoutTemplate, WorkoutTemplateExercise.template_id == WorkoutTemplate.id)
+            .where(WorkoutTemplateExercise.exercise_id.is_(None))
+            .distinct(),
+            _link_template_exercises,
+            batch_size,
+        )
+
+        await _rebuild_rollups(user_ids)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="distinct (user, name) pairs per transaction")
+    args = parser.parse_args()
+    asyncio.run(backfill_exercise_catalog(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
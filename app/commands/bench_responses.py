@@ -0,0 +1,147 @@
+"""
+Compares response serialization for /workouts/session/{id} and
+/workouts/history before and after typed response models.
+
+"before" is the old path: hand-built dicts, FastAPI's jsonable_encoder and a
+json.dumps JSONResponse. "after" is TypeAdapter validation from rows plus
+FastJSONResponse. Only serialization is timed (no database or HTTP).
+
+    python -m app.commands.bench_responses [--exercises 12] [--sets 5] [--history 100] [--repeat 200]
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse
+from app.models.workout_exercise import WorkoutExercise
+from app.models.workout_session import WorkoutSession
+from app.models.workout_set import WorkoutSet
+from app.routers.workouts import _history_items, _session_sets
+from app.schemas.workouts import HistoryOut, SessionDetailOut, SessionExerciseTreeOut, SessionTreeOut
+
+
+def _rows(exercises: int, sets: int, history: int):
+    now = datetime.now(timezone.utc)
+    session = WorkoutSession(
+        id=1, status="finished", title="Push", notes="felt good", started_at=now - timedelta(hours=1), ended_at=now
+    )
+    exs = [WorkoutExercise(id=i, name=f"Exercise {i}", order_index=i) for i in range(exercises)]
+    sets_by_ex = {
+        e.id: [
+            WorkoutSet(id=e.id * sets + n, exercise_id=e.id, set_number=n + 1, reps=8, weight_kg=60.5, created_at=now)
+            for n in range(sets)
+        ]
+        for e in exs
+    }
+    sessions = [
+        WorkoutSession(
+            id=i, title=f"Workout {i}", notes=None, started_at=now - timedelta(days=i, hours=1), ended_at=now - timedelta(days=i)
+        )
+        for i in range(history)
+    ]
+    return session, exs, sets_by_ex, sessions
+
+
+def _session_before(session, exs, sets_by_ex) -> bytes:
+    result = {
+        "found": True,
+        "session": {
+            "id": session.id,
+            "status": session.status,
+            "title": session.title,
+            "notes": session.notes,
+            "started_at": session.started_at,
+            "ended_at": session.ended_at,
+            "exercises": [
+                {
+                    "id": e.id,
+                    "name": e.name,
+                    "order_index": e.order_index,
+                    "sets": [
+                        {
+                            "id": s.id,
+                            "set_number": s.set_number,
+                            "reps": s.reps,
+                            "weight_kg": s.weight_kg,
+                            "created_at": s.created_at,
+                        }
+                        for s in sets_by_ex.get(e.id, [])
+                    ],
+                }
+                for e in exs
+            ],
+        },
+    }
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def _session_after(session, exs, sets_by_ex) -> bytes:
+    tree = SessionTreeOut(
+        id=session.id,
+        status=session.status,
+        started_at=session.started_at,
+        ended_at=session.ended_at,
+        title=session.title,
+        notes=session.notes,
+        exercises=[
+            SessionExerciseTreeOut(
+                id=e.id,
+                name=e.name,
+                order_index=e.order_index,
+                sets=_session_sets.validate_python(sets_by_ex[e.id], from_attributes=True),
+            )
+            for e in exs
+        ],
+    )
+    return FastJSONResponse(SessionDetailOut(found=True, session=tree)).body
+
+
+def _history_before(sessions) -> bytes:
+    result = {
+        "items": [
+            {"id": s.id, "title": s.title, "notes": s.notes, "started_at": s.started_at, "ended_at": s.ended_at}
+            for s in sessions
+        ],
+        "limit": len(sessions),
+        "offset": 0,
+        "next_cursor": None,
+    }
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def _history_after(sessions) -> bytes:
+    out = HistoryOut(
+        items=_history_items.validate_python(sessions, from_attributes=True),
+        limit=len(sessions),
+        offset=0,
+        next_cursor=None,
+    )
+    return FastJSONResponse(out).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--exercises", type=int, default=12)
+    parser.add_argument("--sets", type=int, default=5)
+    parser.add_argument("--history", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    session, exs, sets_by_ex, sessions = _rows(args.exercises, args.sets, args.history)
+    cases = [
+        (f"/session/{{id}} ({args.exercises}x{args.sets} sets)", _session_before, _session_after, (session, exs, sets_by_ex)),
+        (f"/history ({args.history} items)", _history_before, _history_after, (sessions,)),
+    ]
+    for name, before, after, case_args in cases:
+        timings = []
+        for fn in (before, after):
+            fn(*case_args)  # warm up
+            timings.append(min(timeit.repeat(lambda: fn(*case_args), number=args.repeat, repeat=5)) / args.repeat * 1e6)
+        print(f"{name}: before {timings[0]:.0f} us, after {timings[1]:.0f} us ({timings[0] / timings[1]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Runs EXPLAIN for the query shapes the routers issue most and checks that
+each one is served by the index added for it.
+
+    python -m app.commands.check_query_plans
+
+Exits non-zero if any plan misses its index. Run it against a migrated
+database (alembic upgrade head); on SQLite only the schema is used.
+"""
+import asyncio
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.sql import Executable
+
+from app.core.db import engine
+from app.models.exercise_session_summary import ExerciseSessionSummary
+from app.models.food_entry import FoodEntry
+from app.models.nutrition_daily_totals import NutritionDailyTotals
+from app.models.user_exercise_stats import UserExerciseStats
+from app.models.workout_daily_stats import WorkoutDailyExerciseStats, WorkoutDailyStats
+from app.models.workout_exercise import WorkoutExercise
+from app.models.workout_session import WorkoutSession
+from app.models.workout_set import WorkoutSet
+from app.models.workout_template import WorkoutTemplate
+from app.models.workout_template_exercise import WorkoutTemplateExercise
+from app.models.workout_template_set import WorkoutTemplateSet
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    statement: Executable
+    # Any one of these appearing in the plan passes the check.
+    indexes: tuple[str, ...]
+
+
+def plan_checks() -> list[PlanCheck]:
+    user_id = 1
+    since = datetime.now(timezone.utc) - timedelta(days=7)
+    today = date.today()
+
+    return [
+        PlanCheck(
+            "active session",
+            select(WorkoutSession).where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status == "active",
+            ),
+            # SQLite prefers the composite (two equality columns) over the
+            # partial index; Postgres may pick either.
+            ("ix_workout_sessions_user_active", "ix_workout_sessions_user_status_ended_id"),
+        ),
+        PlanCheck(
+            "history",
+            select(WorkoutSession)
+            .where(WorkoutSession.user_id == user_id, WorkoutSession.status == "finished")
+            .order_by(WorkoutSession.ended_at.desc(), WorkoutSession.id.desc())
+            .limit(20),
+            ("ix_workout_sessions_user_status_ended_id",),
+        ),
+        PlanCheck(
+            "history keyset page",
+            select(WorkoutSession)
+            .where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status == "finished",
+                tuple_(WorkoutSession.ended_at, WorkoutSession.id) < tuple_(since, 1000),
+            )
+            .order_by(WorkoutSession.ended_at.desc(), WorkoutSession.id.desc())
+            .limit(21),
+            ("ix_workout_sessions_user_status_ended_id",),
+        ),
+        PlanCheck(
+            "analytics window",
+            select(WorkoutSession.id).where(
+                WorkoutSession.user_id == user_id,
+                WorkoutSession.status == "finished",
+                WorkoutSession.ended_at >= since,
+            ),
+            ("ix_workout_sessions_user_status_ended_id",),
+        ),
+        PlanCheck(
+            "session exercises",
+            select(WorkoutExercise)
+            .where(WorkoutExercise.session_id == 1)
+            .order_by(WorkoutExercise.order_index.asc(), WorkoutExercise.id.asc()),
+            ("ix_workout_exercises_session_order",),
+        ),
+        PlanCheck(
+            "exercise sets",
+            select(WorkoutSet)
+            .where(WorkoutSet.exercise_id.in_([1, 2, 3]))
+            .order_by(WorkoutSet.exercise_id.asc(), WorkoutSet.set_number.asc(), WorkoutSet.id.asc()),
+            ("ix_workout_sets_exercise_set_number",),
+        ),
+        PlanCheck(
+            "analytics sets window",
+            select(func.count(WorkoutSet.id), func.sum(WorkoutSet.reps)).where(
+                WorkoutSet.user_id == user_id,
+                WorkoutSet.performed_at >= since,
+            ),
+            ("ix_workout_sets_user_performed",),
+        ),
+        PlanCheck(
+            "daily rollup window",
+            select(func.sum(WorkoutDailyStats.sets)).where(
+                WorkoutDailyStats.user_id == user_id,
+                WorkoutDailyStats.day >= today - timedelta(days=6),
+            ),
+            ("sqlite_autoindex_workout_daily_stats_1", "workout_daily_stats_pkey"),
+        ),
+        PlanCheck(
+            "daily exercise rollup window",
+            select(WorkoutDailyExerciseStats.exercise_id, func.sum(WorkoutDailyExerciseStats.volume))
+            .where(
+                WorkoutDailyExerciseStats.user_id == user_id,
+                WorkoutDailyExerciseStats.day >= today - timedelta(days=6),
+            )
+            .group_by(WorkoutDailyExerciseStats.exercise_id),
+            ("sqlite_autoindex_workout_daily_exercise_stats_1", "workout_daily_exercise_stats_pkey"),
+        ),
+        PlanCheck(
+            "exercise stats",
+            select(UserExerciseStats).where(UserExerciseStats.user_id == user_id),
+            ("sqlite_autoindex_user_exercise_stats_1", "user_exercise_stats_pkey"),
+        ),
+        PlanCheck(
+            "analytics exercise list",
+            select(WorkoutExercise.name, func.max(WorkoutExercise.id))
+            .where(WorkoutExercise.user_id == user_id, WorkoutExercise.performed_at.isnot(None))
+            .group_by(WorkoutExercise.name),
+            ("ix_workout_exercises_user_performed",),
+        ),
+        PlanCheck(
+            "catalog exercise history",
+            select(WorkoutSet.performed_at, func.max(WorkoutSet.weight_kg))
+            .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
+            .where(WorkoutExercise.exercise_id == 1, WorkoutSet.performed_at.isnot(None))
+            .group_by(WorkoutExercise.session_id, WorkoutSet.performed_at),
+            ("ix_workout_exercises_exercise_id",),
+        ),
+        PlanCheck(
+            "exercise timeline",
+            select(ExerciseSessionSummary.ended_at, ExerciseSessionSummary.top_weight_kg)
+            .where(ExerciseSessionSummary.user_id == user_id, ExerciseSessionSummary.exercise_id == 1)
+            .order_by(ExerciseSessionSummary.ended_at.asc()),
+            ("sqlite_autoindex_exercise_session_summary_1", "exercise_session_summary_pkey"),
+        ),
+        PlanCheck(
+            "exercise purge by name",
+            select(WorkoutExercise.id)
+            .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
+            .where(
+                WorkoutSession.user_id == user_id,
+                func.lower(WorkoutExercise.name) == "bench press",
+            ),
+            ("ix_workout_exercises_lower_name",),
+        ),
+        PlanCheck(
+            "templates",
+            select(WorkoutTemplate)
+            .where(WorkoutTemplate.user_id == user_id)
+            .order_by(WorkoutTemplate.created_at.desc()),
+            ("ix_workout_templates_user_created",),
+        ),
+        PlanCheck(
+            "template exercises",
+            select(WorkoutTemplateExercise)
+            .where(WorkoutTemplateExercise.template_id == 1)
+            .order_by(WorkoutTemplateExercise.order_index.asc()),
+            ("ix_workout_template_exercises_template_order",),
+        ),
+        PlanCheck(
+            "template sets",
+            select(WorkoutTemplateSet)
+            .where(WorkoutTemplateSet.template_exercise_id == 1)
+            .order_by(WorkoutTemplateSet.set_number.asc()),
+            ("ix_workout_template_sets_exercise_set_number",),
+        ),
+        PlanCheck(
+            "nutrition day",
+            select(FoodEntry).where(FoodEntry.user_id == user_id, FoodEntry.date == today),
+            ("ix_food_entries_user_date",),
+        ),
+        PlanCheck(
+            "nutrition range",
+            select(FoodEntry.date, func.sum(FoodEntry.calories))
+            .where(
+                FoodEntry.user_id == user_id,
+                FoodEntry.date >= today - timedelta(days=6),
+                FoodEntry.date <= today,
+            )
+            .group_by(FoodEntry.date),
+            ("ix_food_entries_user_date",),
+        ),
+        PlanCheck(
+            "nutrition daily totals range",
+            select(NutritionDailyTotals).where(
+                NutritionDailyTotals.user_id == user_id,
+                NutritionDailyTotals.date >= today - timedelta(days=6),
+                NutritionDailyTotals.date <= today,
+            ),
+            ("sqlite_autoindex_nutrition_daily_totals_1", "nutrition_daily_totals_pkey"),
+        ),
+    ]
+
+
+async def explain(conn: AsyncConnection, statement: Executable) -> str:
+    sql = str(statement.compile(conn.sync_connection, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        res = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in res.all())
+
+    res = await conn.exec_driver_sql(f"EXPLAIN {sql}")
+    return "\n".join(row[0] for row in res.all())
+
+
+async def _sqlite_schema(conn: AsyncConnection) -> list[str]:
+    res = await conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+        "ORDER BY type = 'index'"
+    )
+    return [row[0] for row in res.all()]
+
+
+async def _run_checks(conn: AsyncConnection) -> bool:
+    ok = True
+    for check in plan_checks():
+        plan = await explain(conn, check.statement)
+        passed = any(index in plan for index in check.indexes)
+        ok = ok and passed
+        print(f"[{'ok' if passed else 'FAIL'}] {check.name}")
+        if not passed:
+            print(f"  expected one of: {', '.join(check.indexes)}")
+            print("  " + plan.replace("\n", "\n  "))
+    return ok
+
+
+async def check_query_plans() -> bool:
+    try:
+        async with engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                # Dev and CI databases are small enough that a seq scan always wins;
+                # we want to know whether the index is usable, not whether it is cheaper yet.
+                await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                ok = await _run_checks(conn)
+            else:
+                schema = await _sqlite_schema(conn)
+    finally:
+        await engine.dispose()
+
+    if engine.dialect.name != "sqlite":
+        return ok
+
+    # ANALYZE statistics from a tiny dev database make SQLite prefer full
+    # scans, so plan against an in-memory copy of the schema without them.
+    scratch = create_async_engine("sqlite+aiosqlite://")
+    try:
+        async with scratch.connect() as conn:
+            for ddl in schema:
+                await conn.exec_driver_sql(ddl)
+            ok = await _run_checks(conn)
+    finally:
+        await scratch.dispose()
+    return ok
+
+
+def main() -> None:
+    sys.exit(0 if asyncio.run(check_query_plans()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Merges one of a user's catalog exercises into another, keeping the old name
+as an alias so future entries under it land on the target.
+
+    python -m app.commands.merge_exercises USER_ID SOURCE_ID TARGET_ID
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.db import AsyncSessionLocal, engine
+from app.core.exercise_catalog import merge_exercises
+
+
+async def _merge(user_id: int, source_id: int, target_id: int) -> bool:
+    try:
+        async with AsyncSessionLocal() as db:
+            merged = await merge_exercises(db, user_id, source_id, target_id)
+            await db.commit()
+    finally:
+        await engine.dispose()
+    return merged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("user_id", type=int)
+    parser.add_argument("source_id", type=int)
+    parser.add_argument("target_id", type=int)
+    args = parser.parse_args()
+
+    if not asyncio.run(_merge(args.user_id, args.source_id, args.target_id)):
+        print("Both exercises must exist, belong to the user and differ", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
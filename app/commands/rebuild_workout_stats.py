@@ -0,0 +1,58 @@
+"""
+Reconciles the daily workout rollups with workout history: every user whose
+stored rollups differ from a recomputation is rebuilt.
+
+    python -m app.commands.rebuild_workout_stats [--user-id ID] [--check]
+
+With --check nothing is written and the exit status is 1 if any user is out
+of sync. The migrations that add the rollup tables backfill them, so
+this is for repairing drift, not a deployment step.
+"""
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import select
+
+from app.core.db import AsyncSessionLocal, engine
+from app.core.workout_stats import rebuild_user, user_is_consistent
+from app.models.user import User
+
+
+async def _reconcile(user_id: int | None, check: bool) -> list[int]:
+    mismatched = []
+    try:
+        async with AsyncSessionLocal() as db:
+            if user_id is None:
+                user_ids = (await db.execute(select(User.id).order_by(User.id))).scalars().all()
+            else:
+                user_ids = [user_id]
+
+            for uid in user_ids:
+                if await user_is_consistent(db, uid):
+                    continue
+                mismatched.append(uid)
+                if not check:
+                    await rebuild_user(db, uid)
+                    # One user per transaction keeps locks short on big tables
+                    await db.commit()
+    finally:
+        await engine.dispose()
+    return mismatched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--check", action="store_true", help="report mismatches without rebuilding")
+    args = parser.parse_args()
+
+    mismatched = asyncio.run(_reconcile(args.user_id, args.check))
+    verb = "out of sync" if args.check else "rebuilt"
+    print(f"{len(mismatched)} user(s) {verb}" + (f": {', '.join(map(str, mismatched))}" if mismatched else ""))
+    if args.check and mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-user cache of rendered analytics responses.
+
+Keys carry a per-user generation token; invalidating a user just replaces
+the token, so every older entry becomes unreachable at once and ages out of
+the backend. A reader takes the token before running its queries, so a
+result computed while a write commits is stored under the old token and
+never served.
+
+Only writes that change finished-session data invalidate: finishing,
+deleting or purging sessions and exercises. Set and exercise edits are
+limited to the active session, which analytics ignore until it is finished.
+Out-of-process writers (app.commands) cannot reach an in-memory backend;
+their effects show up within ANALYTICS_CACHE_TTL_SECONDS.
+"""
+import secrets
+from typing import Protocol
+
+from starlette.responses import Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class MemoryBackend:
+    """In-process LRU backend; bounded by entry count."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class AnalyticsCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def _generation(self, user_id: int) -> str:
+        key = f"analytics-gen:{user_id}"
+        token = await self.backend.get(key)
+        if token is None:
+            # Tokens expire and get evicted like entries; a fresh random one
+            # guarantees nothing cached under an older token is served.
+            token = secrets.token_hex(8).encode()
+            await self.backend.set(key, token)
+        return token.decode()
+
+    async def lookup(self, user_id: int, endpoint: str, *params) -> tuple[str, Response | None]:
+        """Returns the entry key and, on a hit, the cached response."""
+        generation = await self._generation(user_id)
+        key = f"analytics:{user_id}:{generation}:{endpoint}:{params!r}"
+        body = await self.backend.get(key)
+        if body is None:
+            self.misses += 1
+            return key, None
+        self.hits += 1
+        return key, Response(body, media_type="application/json", headers={"X-Cache": "hit"})
+
+    async def store(self, key: str, response: Response) -> Response:
+        await self.backend.set(key, response.body)
+        response.headers["X-Cache"] = "miss"
+        return response
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Call after the write commits."""
+        self.invalidations += 1
+        await self.backend.set(f"analytics-gen:{user_id}", secrets.token_hex(8).encode())
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "backend": self.backend.stats(),
+        }
+
+
+analytics_cache = AnalyticsCache(
+    MemoryBackend(maxsize=settings.ANALYTICS_CACHE_SIZE, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS)
+)
@@ -3,10 +3,73 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
     DATABASE_URL: str = "sqlite+aiosqlite:///./dev.db"
+    # Optional replica for heavy read endpoints; users who committed within
+    # READ_AFTER_WRITE_PIN_SECONDS keep reading from the primary (the pin rides
+    # on the X-Last-Write header / cookie, so it holds across workers).
+    READ_DATABASE_URL: str | None = None
+    READ_AFTER_WRITE_PIN_SECONDS: float = 5
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 1  # connections opened at startup
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg only
+
+    # Applied to every new SQLite connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KIB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268_435_456
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_FOREIGN_KEYS: bool = True
+    SQLITE_OPTIMIZE_ON_SHUTDOWN: bool = True
+
+    # Per-request SQL stats (X-Query-Count / Server-Timing headers)
+    SQL_INSTRUMENTATION: bool = True
+    SQL_SLOW_QUERY_MS: float = 200
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Rendered analytics responses per user, dropped by writes to finished sessions
+    ANALYTICS_CACHE_SIZE: int = 10_000
+    ANALYTICS_CACHE_TTL_SECONDS: float = 300
+
+    # Cache-Control max-age for finished sessions and past calendar months
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 86400
+
+    # Widest start..end span /nutrition/analytics/range accepts, in days
+    NUTRITION_RANGE_MAX_DAYS: int = 3660
+
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    # Fraction of requests whose debug/info records are kept; per-route
+    # overrides are keyed by route path, e.g. {"/workouts/session/{session_id}": 0.1}
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_SAMPLE_RATES: dict[str, float] = {}
     JWT_SECRET: str = "change-me"
     JWT_ALG: str = "HS256"
     ACCESS_TOKEN_MINUTES: int = 15
     REFRESH_TOKEN_DAYS: int = 30
+    TOKEN_CACHE_SIZE: int = 10_000
+
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # bcrypt cost is calibrated at startup to the highest value hashing within
+    # BCRYPT_TARGET_MS, unless BCRYPT_ROUNDS pins it.
+    BCRYPT_ROUNDS: int | None = None
+    BCRYPT_TARGET_MS: float = 100
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+
+    # Shared secret for the /internal metrics endpoints, sent as X-Internal-Token.
+    # Unset (the default) disables them.
+    INTERNAL_API_TOKEN: str | None = None
+
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 300
+    # Let read-only endpoints use the token's `sub` without confirming the user still exists
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
 
 settings = Settings()
 
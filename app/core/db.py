@@ -1,14 +1,148 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy import event, exc, make_url, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import TimingStats
+from app.core.read_after_write import mark_write
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and how often they time out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = TimingStats()
+        self.timeouts = 0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.record((time.perf_counter() - started) * 1000)
+
+
+def engine_options(url: str) -> dict:
+    options = {"echo": False, "future": True, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    db_url = make_url(url)
+    if db_url.get_backend_name() == "sqlite" and db_url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single StaticPool connection; sizing does not apply.
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if db_url.get_driver_name() == "asyncpg":
+        # SQLAlchemy's prepared-statement LRU and asyncpg's own cache; set both
+        # to 0 behind a transaction-mode pgbouncer.
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def sqlite_pragmas() -> list[str]:
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        # negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KIB}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+        f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}",
+    ]
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in sqlite_pragmas():
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def create_engine_for(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(url, **engine_options(url))
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
+
+class PrimarySession(Session):
+    """Sessions bound to the primary. `info["user_id"]` is set once the caller is authenticated."""
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_recent_writer(session: Session) -> None:
+    # So the user's replica reads don't miss their own writes; see app.core.read_after_write
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        mark_write(user_id)
+
+
+engine = create_engine_for(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(
+    engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=PrimarySession
+)
+
+read_engine = create_engine_for(settings.READ_DATABASE_URL) if settings.READ_DATABASE_URL else None
+ReadSessionLocal = (
+    async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+    if read_engine is not None
+    else None
+)
 
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
 
+
+async def warm_up_engine(engine: AsyncEngine, connections: int) -> None:
+    """Opens `connections` pooled connections up front so the first requests don't pay for connecting."""
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+
+async def optimize_sqlite(engine: AsyncEngine) -> None:
+    """Lets SQLite refresh planner statistics it found stale during this process's lifetime."""
+    if engine.dialect.name != "sqlite" or not settings.SQLITE_OPTIMIZE_ON_SHUTDOWN:
+        return
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA optimize")
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.sync_engine.pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkout_wait=pool.checkout_wait.snapshot(),
+            timeouts=pool.timeouts,
+        )
+    return stats
@@ -1,36 +1,95 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import ReadSessionLocal, get_db
+from app.core.principals import Principal, principal_cache
+from app.core.read_after_write import pinned_to_primary
+from app.core.security import InvalidToken, token_service
 from app.models.user import User
 
 bearer = HTTPBearer(auto_error=False)
 
-async def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(bearer),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+
+def _user_id_from_credentials(creds: HTTPAuthorizationCredentials | None) -> int:
     if creds is None or not creds.credentials:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
     token = creds.credentials
     try:
-        data = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
-    except JWTError:
+        data = token_service.decode(token)
+    except InvalidToken:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     if data.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
 
-    user_id = int(data["sub"])
-    res = await db.execute(select(User).where(User.id == user_id))
-    user = res.scalar_one_or_none()
-    if not user:
+    return int(data["sub"])
+
+
+async def get_current_user(
+    creds: HTTPAuthorizationCredentials = Depends(bearer),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    user_id = _user_id_from_credentials(creds)
+
+    db.info["user_id"] = user_id
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    res = await db.execute(
+        select(User.id, User.email, User.created_at).where(User.id == user_id)
+    )
+    row = res.one_or_none()
+    if not row:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
-    return user
+    principal = Principal(id=row.id, email=row.email, created_at=row.created_at)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+async def get_token_user(
+    creds: HTTPAuthorizationCredentials = Depends(bearer),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """
+    For read-only endpoints. With AUTH_TRUST_TOKEN_CLAIMS the signed `sub`
+    is trusted as-is and no users lookup happens at all.
+    """
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        return Principal(id=_user_id_from_credentials(creds))
+    return await get_current_user(creds, db)
+
+
+async def get_read_db(
+    request: Request,
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncSession:
+    """
+    Session for heavy read-only endpoints. Uses the READ_DATABASE_URL replica
+    when configured, unless the user committed to the primary within
+    READ_AFTER_WRITE_PIN_SECONDS (see app.core.read_after_write).
+    """
+    if ReadSessionLocal is None or pinned_to_primary(request, user.id):
+        yield db
+        return
+
+    async with ReadSessionLocal() as session:
+        yield session
+
 
+def require_internal_token(x_internal_token: str | None = Header(default=None)) -> None:
+    """Gate for /internal: 404 unless INTERNAL_API_TOKEN is set and presented."""
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(x_internal_token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid internal token")
@@ -0,0 +1,40 @@
+"""
+Conditional GET helpers. ETags are derived from stored resource versions
+(not from the rendered body), so a matching If-None-Match can be answered
+before any child rows are loaded.
+"""
+import hashlib
+
+from starlette.responses import Response
+
+from app.core.config import settings
+
+REVALIDATE = "private, no-cache"
+
+
+def long_lived() -> str:
+    """Cache-Control for data that only changes on rare edits (finished sessions, past months)."""
+    return f"private, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}"
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str, cache_control: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
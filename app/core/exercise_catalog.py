@@ -0,0 +1,101 @@
+from sqlalchemy import delete, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.workout_stats import rebuild_user
+from app.models.exercise import Exercise, ExerciseAlias
+from app.models.workout_exercise import WorkoutExercise
+from app.models.workout_template_exercise import WorkoutTemplateExercise
+
+
+def normalize_exercise_name(name: str) -> str:
+    """Catalog key for a name: "  Bench   press " and "bench press" are the same exercise."""
+    return " ".join(name.split()).casefold()
+
+
+def catalog_lookup(user_id: int, keys: list[str]):
+    """(normalized_name, exercise_id) rows for the given normalized names, aliases included."""
+    return union_all(
+        select(Exercise.normalized_name, Exercise.id.label("exercise_id")).where(
+            Exercise.user_id == user_id,
+            Exercise.normalized_name.in_(keys),
+        ),
+        select(ExerciseAlias.normalized_name, ExerciseAlias.exercise_id).where(
+            ExerciseAlias.user_id == user_id,
+            ExerciseAlias.normalized_name.in_(keys),
+        ),
+    )
+
+
+async def _lookup(db: AsyncSession, user_id: int, keys: list[str]) -> dict[str, int]:
+    res = await db.execute(catalog_lookup(user_id, keys))
+    return {key: exercise_id for key, exercise_id in res.all()}
+
+
+async def resolve_exercise_ids(db: AsyncSession, user_id: int, names: list[str]) -> dict[str, int]:
+    """
+    Maps each name to the user's catalog exercise id, creating entries for
+    names not seen before. The caller commits.
+    """
+    # First spelling of a new name becomes its display name.
+    keys: dict[str, str] = {}
+    for name in names:
+        keys.setdefault(normalize_exercise_name(name), " ".join(name.split()))
+
+    found = await _lookup(db, user_id, list(keys))
+    missing = [key for key in keys if key not in found]
+    if missing:
+        insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+        await db.execute(
+            insert(Exercise)
+            .values([{"user_id": user_id, "name": keys[key], "normalized_name": key} for key in missing])
+            # A concurrent request may have just created the same entry
+            .on_conflict_do_nothing(index_elements=["user_id", "normalized_name"])
+        )
+        found.update(await _lookup(db, user_id, missing))
+
+    return {name: found[normalize_exercise_name(name)] for name in names}
+
+
+async def resolve_exercise_id(db: AsyncSession, user_id: int, name: str) -> int:
+    return (await resolve_exercise_ids(db, user_id, [name]))[name]
+
+
+async def merge_exercises(db: AsyncSession, user_id: int, source_id: int, target_id: int) -> bool:
+    """
+    Folds catalog exercise `source_id` into `target_id`: history and templates
+    are repointed and the source name is kept as an alias. The caller commits.
+    """
+    res = await db.execute(
+        select(Exercise).where(Exercise.user_id == user_id, Exercise.id.in_([source_id, target_id]))
+    )
+    found = {e.id: e for e in res.scalars().all()}
+    if source_id == target_id or len(found) != 2:
+        return False
+
+    await db.execute(
+        update(WorkoutExercise)
+        .where(WorkoutExercise.exercise_id == source_id)
+        .values(exercise_id=target_id)
+    )
+    await db.execute(
+        update(WorkoutTemplateExercise)
+        .where(WorkoutTemplateExercise.exercise_id == source_id)
+        .values(exercise_id=target_id)
+    )
+    await db.execute(
+        update(ExerciseAlias)
+        .where(ExerciseAlias.exercise_id == source_id)
+        .values(exercise_id=target_id)
+    )
+    db.add(
+        ExerciseAlias(
+            user_id=user_id,
+            exercise_id=target_id,
+            normalized_name=found[source_id].normalized_name,
+        )
+    )
+    await db.execute(delete(Exercise).where(Exercise.id == source_id))
+    # Per-exercise rollups are keyed by catalog id
+    await rebuild_user(db, user_id)
+    return True
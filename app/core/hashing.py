@@ -0,0 +1,117 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import TimingStats
+from app.core.security import (
+    calibrate_bcrypt_rounds,
+    hash_password,
+    password_needs_rehash,
+    set_bcrypt_rounds,
+    verify_password,
+)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool so the event loop keeps serving
+    other requests. bcrypt releases the GIL, so threads scale with cores.
+
+    At most `max_pending` jobs may be running or queued; beyond that callers
+    get a 503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self.rounds: int | None = None
+        self.rejected = 0
+        self.queue_wait = TimingStats()
+        self.hash_time = TimingStats()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    async def configure_cost(self) -> int:
+        """Sets the bcrypt cost from settings, calibrating it on the pool if not pinned."""
+        rounds = settings.BCRYPT_ROUNDS
+        if rounds is None:
+            loop = asyncio.get_running_loop()
+            rounds = await loop.run_in_executor(
+                self._get_executor(),
+                lambda: calibrate_bcrypt_rounds(
+                    target_ms=settings.BCRYPT_TARGET_MS,
+                    min_rounds=settings.BCRYPT_MIN_ROUNDS,
+                    max_rounds=settings.BCRYPT_MAX_ROUNDS,
+                ),
+            )
+        set_bcrypt_rounds(rounds)
+        self.rounds = rounds
+        return rounds
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        def job():
+            started = time.perf_counter()
+            result = fn(*args)
+            return result, started, time.perf_counter()
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._get_executor(), job)
+        finally:
+            self._pending -= 1
+
+        self.queue_wait.record((started - submitted) * 1000)
+        self.hash_time.record((finished - started) * 1000)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(verify_password, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_needs_rehash(password_hash)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "bcrypt_rounds": self.rounds,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "hash_time": self.hash_time.snapshot(),
+        }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,119 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: str | None = None
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.shapes[statement] += 1
+        if ms > self.slowest_ms:
+            self.slowest_ms = ms
+            self.slowest_statement = statement
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least `threshold` times in one request: likely N+1 loops."""
+        return [(stmt, n) for stmt, n in self.shapes.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, ms)
+
+    if ms >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning("slow query (%.1f ms): %s", ms, statement)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the SQL statements run while handling each request and reports
+    them as `X-Query-Count` and `Server-Timing` response headers. Requests
+    that repeat one statement shape SQL_N_PLUS_ONE_THRESHOLD times or more
+    also get `X-N-Plus-One` and a warning log.
+
+    Headers go out with `http.response.start`, so they only cover the
+    statements run before it: queries from a streamed body or from
+    background tasks (e.g. the password rehash after login) are missing
+    from them. The N+1 warning is logged once the request has fully
+    finished and does include those.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Query-Count", str(stats.count))
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", '
+                    f"db-slowest;dur={stats.slowest_ms:.1f}",
+                )
+
+                repeated = stats.repeated_shapes(settings.SQL_N_PLUS_ONE_THRESHOLD)
+                if repeated:
+                    headers.append("X-N-Plus-One", str(len(repeated)))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+
+        repeated = stats.repeated_shapes(settings.SQL_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            statement, times = repeated[0]
+            logger.warning(
+                "likely N+1 in %s %s: statement ran %d times: %s",
+                scope["method"],
+                scope["path"],
+                times,
+                statement,
+            )
@@ -0,0 +1,200 @@
+"""
+Application logging: records are handed to a queue in the request path and
+formatted/written by a background listener thread, so handlers never block
+the event loop. Each record carries the request's correlation id and route.
+
+Below WARNING, records are sampled per request: LOG_SAMPLE_RATES maps route
+paths (e.g. "/workouts/session/{session_id}") to the fraction of requests
+whose debug/info records are kept, defaulting to LOG_SAMPLE_RATE.
+"""
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.db import InstrumentedQueuePool
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Attributes every LogRecord has; anything else came in through `extra=`.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id", "route"}
+
+
+@dataclass
+class RequestContext:
+    request_id: str
+    scope: Scope
+    sampled: bool | None = None
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the scope before the endpoint runs.
+        route = self.scope.get("route")
+        return getattr(route, "path", self.scope["path"])
+
+
+_request_context: ContextVar[RequestContext | None] = ContextVar("request_context", default=None)
+
+
+def current_request_id() -> str | None:
+    ctx = _request_context.get()
+    return ctx.request_id if ctx else None
+
+
+class RequestContextFilter(logging.Filter):
+    """Tags records with the request id and applies per-route sampling."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = _request_context.get()
+        if ctx is None:
+            record.request_id = None
+            record.route = None
+            return True
+
+        record.request_id = ctx.request_id
+        record.route = ctx.route
+        if record.levelno >= logging.WARNING:
+            return True
+        if ctx.sampled is None:
+            rate = settings.LOG_SAMPLE_RATES.get(record.route, settings.LOG_SAMPLE_RATE)
+            ctx.sampled = rate >= 1 or random.random() < rate
+        return ctx.sampled
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+            entry["route"] = record.route
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args and tracebacks while they are still valid, but leave
+        # the layout to the listener's formatter.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def configure_logging() -> None:
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL.upper())
+    app_logger.handlers = [handler]
+    app_logger.propagate = False
+    # SQLAlchemy logs pool lifecycle events at INFO under the pool class's own
+    # name, which now sits below "app"; keep those at its default level.
+    logging.getLogger(f"{InstrumentedQueuePool.__module__}.{InstrumentedQueuePool.__name__}").setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flushes queued records; call once the app has stopped handling requests."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _valid_request_id(value: str) -> bool:
+    return 0 < len(value) <= 128 and value.isascii() and value.isprintable()
+
+
+class RequestIdMiddleware:
+    """
+    Uses the caller's X-Request-ID (or a new one) as the correlation id for
+    every record logged while handling the request, echoes it in the
+    response, and logs one line per request with its status and duration.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not _valid_request_id(request_id):
+            request_id = uuid.uuid4().hex
+
+        ctx = RequestContext(request_id=request_id, scope=scope)
+        token = _request_context.set(ctx)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s %s %d",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    extra={"status": status_code, "duration_ms": round((time.perf_counter() - started) * 1000, 1)},
+                )
+            _request_context.reset(token)
@@ -0,0 +1,97 @@
+"""
+Per-user daily nutrition totals (NutritionDailyTotals), kept in step with
+food_entries by signed deltas applied in the same transaction as each entry
+write. Deltas are upserts that increment the stored sums, so concurrent
+writes to the same day don't lose updates; a day's row is dropped when its
+last entry is deleted.
+
+app.commands.reconcile_nutrition_totals checks the table against the
+entries and rebuilds users that drifted.
+"""
+import math
+from datetime import date
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.food_entry import FoodEntry
+from app.models.nutrition_daily_totals import NutritionDailyTotals
+
+TOTALS = ("calories", "protein_g", "carbs_g", "fat_g")
+_COUNTERS = ("entries", *TOTALS)
+
+
+def _insert(db: AsyncSession):
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+
+def entry_totals(entry: FoodEntry) -> dict:
+    return {c: getattr(entry, c) or 0 for c in TOTALS}
+
+
+async def apply_delta(db: AsyncSession, user_id: int, day: date, delta: dict) -> None:
+    """Adds `delta` (any of entries, calories and the macros) to the user's totals for `day`."""
+    if not any(delta.values()):
+        return
+    stmt = _insert(db)(NutritionDailyTotals)
+    await db.execute(
+        stmt.values(user_id=user_id, date=day, **{c: delta.get(c, 0) for c in _COUNTERS}).on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={c: getattr(NutritionDailyTotals, c) + getattr(stmt.excluded, c) for c in _COUNTERS},
+        )
+    )
+    if delta.get("entries", 0) < 0:
+        await db.execute(
+            delete(NutritionDailyTotals).where(
+                NutritionDailyTotals.user_id == user_id,
+                NutritionDailyTotals.date == day,
+                NutritionDailyTotals.entries <= 0,
+            )
+        )
+
+
+async def add_entry(db: AsyncSession, entry: FoodEntry) -> None:
+    await apply_delta(db, entry.user_id, entry.date, {"entries": 1, **entry_totals(entry)})
+
+
+async def remove_entry(db: AsyncSession, entry: FoodEntry) -> None:
+    delta = {c: -v for c, v in entry_totals(entry).items()}
+    await apply_delta(db, entry.user_id, entry.date, {"entries": -1, **delta})
+
+
+def _expected_query(user_id: int):
+    return (
+        select(
+            FoodEntry.date,
+            func.count(FoodEntry.id).label("entries"),
+            *(func.sum(getattr(FoodEntry, c)).label(c) for c in TOTALS),
+        )
+        .where(FoodEntry.user_id == user_id)
+        .group_by(FoodEntry.date)
+    )
+
+
+async def rebuild_user(db: AsyncSession, user_id: int) -> None:
+    """Recomputes the user's totals from their entries. The caller commits."""
+    res = await db.execute(_expected_query(user_id))
+    rows = [{"user_id": user_id, **r._mapping} for r in res.all()]
+    await db.execute(delete(NutritionDailyTotals).where(NutritionDailyTotals.user_id == user_id))
+    if rows:
+        await db.execute(_insert(db)(NutritionDailyTotals), rows)
+
+
+async def user_is_consistent(db: AsyncSession, user_id: int) -> bool:
+    res = await db.execute(_expected_query(user_id))
+    expected = {r.date: r for r in res.all()}
+    res = await db.execute(
+        select(NutritionDailyTotals.date, *(getattr(NutritionDailyTotals, c) for c in _COUNTERS)).where(
+            NutritionDailyTotals.user_id == user_id
+        )
+    )
+    stored = {r.date: r for r in res.all()}
+    return expected.keys() == stored.keys() and all(
+        math.isclose(getattr(expected[d], c), getattr(stored[d], c), rel_tol=1e-9, abs_tol=1e-6)
+        for d in expected
+        for c in _COUNTERS
+    )
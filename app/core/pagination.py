@@ -0,0 +1,20 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(ended_at: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for the last row of a page ordered by (ended_at DESC, id DESC)."""
+    raw = json.dumps([ended_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ended_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(ended_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
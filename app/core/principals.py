@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    The authenticated caller. Handlers only need the id; email and created_at
+    are filled when the principal was loaded from the users table and are
+    None when it was built from token claims alone.
+    """
+
+    id: int
+    email: str | None = None
+    created_at: datetime | None = None
+
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop(user_id)
+
+
+# ORM updates/deletes of a user drop the cached principal. Bulk Core
+# statements against users must call invalidate_principal() themselves.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_write(mapper, connection, target: User) -> None:
+    invalidate_principal(target.id)
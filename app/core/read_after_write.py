@@ -0,0 +1,101 @@
+"""
+Read-your-writes for replica reads. A user who committed to the primary
+within READ_AFTER_WRITE_PIN_SECONDS keeps reading from the primary.
+
+The pin travels with the client so it holds across workers and hosts:
+responses to a request that committed carry the commit time as the
+`X-Last-Write` header and a cookie of the same name, and get_read_db honours
+either one sent back. Browsers on the same site return the cookie on their
+own; cross-site and native clients echo the header. A forged or stale value
+can only send reads to the primary. The per-process set of recent writers
+still covers clients that send neither.
+"""
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+LAST_WRITE_HEADER = "X-Last-Write"
+LAST_WRITE_COOKIE = "last_write"
+
+# Users who committed recently on this process
+recent_writers = TTLCache(maxsize=100_000, ttl=settings.READ_AFTER_WRITE_PIN_SECONDS)
+
+
+@dataclass
+class _RequestWrite:
+    user_id: int | None = None
+    at: float | None = None
+
+
+_current_write: ContextVar[_RequestWrite | None] = ContextVar("request_write", default=None)
+
+
+def mark_write(user_id: int) -> None:
+    """Records a commit by `user_id`; called from the primary session's after_commit hook."""
+    recent_writers.set(user_id, True)
+    write = _current_write.get()
+    if write is not None:
+        write.user_id, write.at = user_id, time.time()
+
+
+def _pin_value(user_id: int, at: float) -> str:
+    return f"{user_id}.{int(at * 1000)}"
+
+
+def _pinned_by_client(value: str | None, user_id: int) -> bool:
+    if not value:
+        return False
+    pinned_user, _, at_ms = value.partition(".")
+    if pinned_user != str(user_id) or not at_ms.isdigit():
+        return False
+    return 0 <= time.time() - int(at_ms) / 1000 < settings.READ_AFTER_WRITE_PIN_SECONDS
+
+
+def pinned_to_primary(request: Request, user_id: int) -> bool:
+    return (
+        recent_writers.get(user_id) is not None
+        or _pinned_by_client(request.headers.get(LAST_WRITE_HEADER), user_id)
+        or _pinned_by_client(request.cookies.get(LAST_WRITE_COOKIE), user_id)
+    )
+
+
+class ReadAfterWriteMiddleware:
+    """Adds the `X-Last-Write` header and cookie to responses of requests that committed."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        write = _RequestWrite()
+        token = _current_write.set(write)
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and write.at is not None:
+                value = _pin_value(write.user_id, write.at)
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={value}; Max-Age={math.ceil(settings.READ_AFTER_WRITE_PIN_SECONDS)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                if scope.get("scheme") == "https":
+                    cookie += "; Secure"
+                headers = MutableHeaders(scope=message)
+                headers.append(LAST_WRITE_HEADER, value)
+                headers.append("Set-Cookie", cookie)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _current_write.reset(token)
@@ -0,0 +1,156 @@
+import hashlib
+import secrets
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import InvalidToken, token_service
+from app.models.refresh_token import RefreshToken
+
+
+def _timestamp(dt: datetime) -> float:
+    # SQLite hands DateTime(timezone=True) values back naive; they are stored as UTC.
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class RevokedFamilies:
+    """
+    In-process set of revoked refresh-token families, mapped to the time the
+    last token in the family expires. A refresh presenting a token from a
+    revoked family is rejected without touching the database.
+
+    This is only an accelerator: reuse is always caught by the conditional
+    UPDATE in rotate_refresh_token(), even for revocations made by another
+    worker that this process has not seen yet.
+    """
+
+    def __init__(self):
+        self._families: dict[str, float] = {}
+
+    def add(self, family_id: str, expires_at: datetime) -> None:
+        self._families[family_id] = _timestamp(expires_at)
+
+    def replace(self, items) -> None:
+        self._families = {family_id: _timestamp(expires_at) for family_id, expires_at in items}
+
+    def __contains__(self, family_id: str) -> bool:
+        expires_at = self._families.get(family_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._families[family_id]
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._families)
+
+
+revoked_families = RevokedFamilies()
+
+
+def issue_refresh_token(db: AsyncSession, user_id: int, family_id: str | None = None) -> str:
+    """Adds the token row to `db`; the caller commits."""
+    jti = secrets.token_hex(16)
+    family_id = family_id or secrets.token_hex(16)
+
+    db.add(
+        RefreshToken(
+            jti=jti,
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + token_service.refresh_ttl,
+        )
+    )
+    return token_service.create_refresh_token(user_id, jti=jti, family_id=family_id)
+
+
+async def revoke_family(db: AsyncSession, family_id: str) -> None:
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    await db.commit()
+    revoked_families.add(family_id, now + token_service.refresh_ttl)
+
+
+async def _rotate_legacy_token(db: AsyncSession, user_id: int, claims: dict, token: str) -> str:
+    """
+    Tokens issued before rotation existed carry no jti. The first use records
+    one keyed by a digest of the token (already used) in a new family, so a
+    replay is caught like any other reuse.
+    """
+    jti = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    family_id = secrets.token_hex(16)
+    insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+    now = datetime.now(timezone.utc)
+    res = await db.execute(
+        insert(RefreshToken)
+        .values(
+            jti=jti,
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=datetime.fromtimestamp(claims["exp"], timezone.utc),
+            used_at=now,
+        )
+        .on_conflict_do_nothing(index_elements=["jti"])
+    )
+    if res.rowcount != 1:
+        used = await db.execute(select(RefreshToken.family_id).where(RefreshToken.jti == jti))
+        await revoke_family(db, used.scalar_one())
+        raise InvalidToken("Refresh token reuse detected")
+
+    return issue_refresh_token(db, user_id, family_id)
+
+
+async def rotate_refresh_token(db: AsyncSession, claims: dict, token: str) -> str:
+    """
+    Marks the presented token used and returns its replacement in the same
+    family; the caller commits. Presenting a token that was already rotated
+    revokes the family and raises InvalidToken.
+    """
+    user_id = int(claims["sub"])
+    jti = claims.get("jti")
+    family_id = claims.get("fam")
+
+    if jti is None or family_id is None:
+        return await _rotate_legacy_token(db, user_id, claims, token)
+
+    if family_id in revoked_families:
+        raise InvalidToken("Refresh token revoked")
+
+    res = await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(used_at=datetime.now(timezone.utc))
+    )
+    if res.rowcount != 1:
+        await revoke_family(db, family_id)
+        raise InvalidToken("Refresh token reuse detected")
+
+    return issue_refresh_token(db, user_id, family_id)
+
+
+async def load_revoked_families(db: AsyncSession) -> None:
+    """Drops expired token rows and rebuilds the in-process revocation set."""
+    now = datetime.now(timezone.utc)
+    await db.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now))
+
+    res = await db.execute(
+        select(RefreshToken.family_id, func.max(RefreshToken.expires_at).label("expires_at"))
+        .where(RefreshToken.revoked_at.isnot(None))
+        .group_by(RefreshToken.family_id)
+    )
+    revoked_families.replace((r.family_id, r.expires_at) for r in res.all())
+    await db.commit()
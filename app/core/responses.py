@@ -0,0 +1,22 @@
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by pydantic-core instead of json.dumps, with no
+    jsonable_encoder pass. Handlers return it directly (which also skips
+    FastAPI's response_model re-validation); the route's response_model
+    still documents the shape.
+
+    Models are dumped with exclude_unset, so optional envelope fields
+    (e.g. `detail`) only appear when the handler set them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, exclude_unset=True)
+        return to_json(content)
@@ -1,9 +1,12 @@
+import math
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Literal
 from jose import JWTError
-from jose import jwt
+from jose import jwk, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -15,33 +18,118 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
-def create_token(*, user_id: int, token_type: TokenType, expires_delta: timedelta) -> str:
-    now = datetime.now(timezone.utc)
-    payload = {
-        "sub": str(user_id),
-        "type": token_type,
-        "iat": int(now.timestamp()),
-        "exp": int((now + expires_delta).timestamp()),
-    }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG)
-
-def create_access_token(user_id: int) -> str:
-    return create_token(
-        user_id=user_id,
-        token_type="access",
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_MINUTES),
-    )
+def password_needs_rehash(password_hash: str) -> bool:
+    return pwd_context.needs_update(password_hash)
+
+def calibrate_bcrypt_rounds(*, target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """
+    Highest bcrypt cost whose hash time stays within target_ms on this
+    machine, clamped to [min_rounds, max_rounds]. Each extra round doubles
+    the work, so one timing at min_rounds is enough to extrapolate.
+    """
+    handler = pwd_context.handler("bcrypt").using(rounds=min_rounds)
+    elapsed_ms = float("inf")
+    for _ in range(2):
+        started = time.perf_counter()
+        handler.hash("calibration")
+        elapsed_ms = min(elapsed_ms, (time.perf_counter() - started) * 1000)
 
-def create_refresh_token(user_id: int) -> str:
-    return create_token(
-        user_id=user_id,
-        token_type="refresh",
-        expires_delta=timedelta(days=settings.REFRESH_TOKEN_DAYS),
+    if elapsed_ms >= target_ms:
+        return min_rounds
+    extra = int(math.log2(target_ms / elapsed_ms))
+    return max(min_rounds, min(max_rounds, min_rounds + extra))
+
+def set_bcrypt_rounds(rounds: int) -> None:
+    # Pinning min and max to the same cost makes needs_update() flag hashes
+    # made at any other cost, so they get rehashed on the next login.
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
     )
 
-def decode_token(token: str) -> dict:
-    try:
-        return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
-    except JWTError:
-        raise ValueError("Invalid token")
 
+class InvalidToken(ValueError):
+    pass
+
+
+class TokenService:
+    """
+    Issues and validates JWTs. The signing key is constructed once instead of
+    on every encode/decode, and verified tokens are cached until their `exp`
+    so a client replaying the same access token skips the HMAC check.
+
+    Cached claims are shared between requests and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        *,
+        secret: str,
+        algorithm: str,
+        access_ttl: timedelta,
+        refresh_ttl: timedelta,
+        cache_size: int,
+    ):
+        self.algorithm = algorithm
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        self._key = jwk.construct(secret, algorithm)
+        self._algorithms = [algorithm]
+        self._verified = TTLCache(maxsize=cache_size, ttl=access_ttl.total_seconds())
+
+    def create_token(
+        self,
+        *,
+        user_id: int,
+        token_type: TokenType,
+        expires_delta: timedelta,
+        claims: dict | None = None,
+    ) -> str:
+        now = datetime.now(timezone.utc)
+        payload = {
+            "sub": str(user_id),
+            "type": token_type,
+            "iat": int(now.timestamp()),
+            "exp": int((now + expires_delta).timestamp()),
+            **(claims or {}),
+        }
+        return jwt.encode(payload, self._key, algorithm=self.algorithm)
+
+    def create_access_token(self, user_id: int) -> str:
+        return self.create_token(user_id=user_id, token_type="access", expires_delta=self.access_ttl)
+
+    def create_refresh_token(self, user_id: int, *, jti: str, family_id: str) -> str:
+        return self.create_token(
+            user_id=user_id,
+            token_type="refresh",
+            expires_delta=self.refresh_ttl,
+            claims={"jti": jti, "fam": family_id},
+        )
+
+    def decode(self, token: str, *, cache: bool = True) -> dict:
+        if cache:
+            claims = self._verified.get(token)
+            if claims is not None:
+                return claims
+
+        try:
+            claims = jwt.decode(token, self._key, algorithms=self._algorithms)
+        except JWTError:
+            raise InvalidToken("Invalid token")
+
+        if cache:
+            self._verified.set(token, claims, ttl=claims["exp"] - time.time())
+        return claims
+
+    def stats(self) -> dict:
+        return self._verified.stats()
+
+
+token_service = TokenService(
+    secret=settings.JWT_SECRET,
+    algorithm=settings.JWT_ALG,
+    access_ttl=timedelta(minutes=settings.ACCESS_TOKEN_MINUTES),
+    refresh_ttl=timedelta(days=settings.REFRESH_TOKEN_DAYS),
+    cache_size=settings.TOKEN_CACHE_SIZE,
+)
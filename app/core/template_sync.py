@@ -0,0 +1,195 @@
+"""
+Reconciles a template's stored exercise/set tree with a submitted one.
+
+Submitted rows are matched to stored rows by id, then by (name, order_index)
+for exercises and by set_number for sets. Matched rows keep their ids, so
+sessions' source_template_* links stay valid; only rows that actually
+changed are written, each kind of change as one bulk statement. The
+caller commits.
+"""
+from dataclasses import dataclass
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exercise_catalog import normalize_exercise_name, resolve_exercise_ids
+from app.models.workout_template_exercise import WorkoutTemplateExercise
+from app.models.workout_template_set import WorkoutTemplateSet
+from app.schemas.workouts import TemplateExerciseIn, TemplateSetIn
+
+
+@dataclass
+class SyncCounts:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+
+def _match_exercises(stored: list, submitted: list[TemplateExerciseIn]) -> list:
+    """Stored row (or None) for each submitted exercise, in submission order."""
+    by_id = {row.id: row for row in stored}
+    unmatched = {row.id for row in stored}
+    matches = [None] * len(submitted)
+
+    for i, ex in enumerate(submitted):
+        if ex.id is not None and ex.id in unmatched:
+            matches[i] = by_id[ex.id]
+            unmatched.discard(ex.id)
+
+    by_key: dict[tuple, list] = {}
+    for row in stored:
+        if row.id in unmatched:
+            by_key.setdefault((normalize_exercise_name(row.name), row.order_index), []).append(row)
+    for i, ex in enumerate(submitted):
+        if matches[i] is None:
+            candidates = by_key.get((normalize_exercise_name(ex.name), ex.order_index or 0))
+            if candidates:
+                matches[i] = candidates.pop(0)
+    return matches
+
+
+def _match_sets(stored: list, submitted: list[TemplateSetIn]) -> list:
+    by_id = {row.id: row for row in stored}
+    unmatched = {row.id for row in stored}
+    matches = [None] * len(submitted)
+
+    for i, s in enumerate(submitted):
+        if s.id is not None and s.id in unmatched:
+            matches[i] = by_id[s.id]
+            unmatched.discard(s.id)
+
+    by_number: dict[int, list] = {}
+    for row in stored:
+        if row.id in unmatched:
+            by_number.setdefault(row.set_number, []).append(row)
+    for i, s in enumerate(submitted):
+        if matches[i] is None and by_number.get(s.set_number):
+            matches[i] = by_number[s.set_number].pop(0)
+    return matches
+
+
+async def sync_template_exercises(
+    db: AsyncSession, template_id: int, user_id: int, submitted: list[TemplateExerciseIn]
+) -> SyncCounts:
+    counts = SyncCounts()
+
+    ex_res = await db.execute(
+        select(
+            WorkoutTemplateExercise.id,
+            WorkoutTemplateExercise.name,
+            WorkoutTemplateExercise.order_index,
+            WorkoutTemplateExercise.exercise_id,
+        ).where(WorkoutTemplateExercise.template_id == template_id)
+    )
+    stored_exercises = ex_res.all()
+
+    set_res = await db.execute(
+        select(
+            WorkoutTemplateSet.id,
+            WorkoutTemplateSet.template_exercise_id,
+            WorkoutTemplateSet.set_number,
+            WorkoutTemplateSet.reps,
+            WorkoutTemplateSet.weight_kg,
+        )
+        .join(WorkoutTemplateExercise, WorkoutTemplateSet.template_exercise_id == WorkoutTemplateExercise.id)
+        .where(WorkoutTemplateExercise.template_id == template_id)
+        .order_by(WorkoutTemplateSet.id.asc())
+    )
+    stored_sets: dict[int, list] = {}
+    for row in set_res.all():
+        stored_sets.setdefault(row.template_exercise_id, []).append(row)
+
+    matches = _match_exercises(stored_exercises, submitted)
+
+    # Catalog ids only need resolving for new or renamed exercises.
+    names = [
+        ex.name
+        for ex, row in zip(submitted, matches)
+        if row is None or ex.name != row.name or row.exercise_id is None
+    ]
+    catalog_ids = await resolve_exercise_ids(db, user_id, names) if names else {}
+
+    exercise_updates = []
+    new_exercises = []
+    for ex, row in zip(submitted, matches):
+        order_index = ex.order_index or 0
+        if row is None:
+            new_exercises.append(
+                {
+                    "template_id": template_id,
+                    "exercise_id": catalog_ids[ex.name],
+                    "name": ex.name,
+                    "order_index": order_index,
+                }
+            )
+        elif ex.name != row.name or order_index != row.order_index or row.exercise_id is None:
+            exercise_updates.append(
+                {
+                    "id": row.id,
+                    "exercise_id": catalog_ids.get(ex.name, row.exercise_id),
+                    "name": ex.name,
+                    "order_index": order_index,
+                }
+            )
+
+    matched_ids = {row.id for row in matches if row is not None}
+    removed_exercise_ids = [row.id for row in stored_exercises if row.id not in matched_ids]
+
+    new_exercise_ids = []
+    if new_exercises:
+        res = await db.scalars(
+            insert(WorkoutTemplateExercise).returning(WorkoutTemplateExercise.id, sort_by_parameter_order=True),
+            new_exercises,
+        )
+        new_exercise_ids = res.all()
+    if exercise_updates:
+        await db.execute(update(WorkoutTemplateExercise), exercise_updates)
+
+    counts.inserted += len(new_exercises)
+    counts.updated += len(exercise_updates)
+    counts.deleted += len(removed_exercise_ids)
+
+    # Sets
+    new_ids = iter(new_exercise_ids)
+    set_updates = []
+    new_sets = []
+    removed_set_ids = []
+    for ex, row in zip(submitted, matches):
+        if row is None:
+            parent_id = next(new_ids)
+            stored = []
+        else:
+            parent_id = row.id
+            stored = stored_sets.get(row.id, [])
+
+        set_matches = _match_sets(stored, ex.sets)
+        for s, srow in zip(ex.sets, set_matches):
+            values = {"set_number": s.set_number, "reps": s.target_reps, "weight_kg": s.target_weight_kg}
+            if srow is None:
+                new_sets.append({"template_exercise_id": parent_id, **values})
+            elif (srow.set_number, srow.reps, srow.weight_kg) != tuple(values.values()):
+                set_updates.append({"id": srow.id, **values})
+
+        kept = {srow.id for srow in set_matches if srow is not None}
+        removed_set_ids += [srow.id for srow in stored if srow.id not in kept]
+
+    # Sets of removed exercises go explicitly too, rather than relying on
+    # the FK cascade (SQLite only enforces it with foreign_keys=ON).
+    if removed_exercise_ids:
+        removed_set_ids += [s.id for ex_id in removed_exercise_ids for s in stored_sets.get(ex_id, [])]
+
+    if removed_set_ids:
+        await db.execute(delete(WorkoutTemplateSet).where(WorkoutTemplateSet.id.in_(removed_set_ids)))
+    if removed_exercise_ids:
+        await db.execute(
+            delete(WorkoutTemplateExercise).where(WorkoutTemplateExercise.id.in_(removed_exercise_ids))
+        )
+    if set_updates:
+        await db.execute(update(WorkoutTemplateSet), set_updates)
+    if new_sets:
+        await db.execute(insert(WorkoutTemplateSet), new_sets)
+
+    counts.inserted += len(new_sets)
+    counts.updated += len(set_updates)
+    counts.deleted += len(removed_set_ids)
+    return counts
@@ -0,0 +1,102 @@
+"""
+Portable date bucketing for analytics queries.
+
+Window bounds are computed here in Python and bound as parameters, so
+range predicates compare the raw column and can use its index. Bucketing
+compiles to date_trunc() on Postgres and date() modifiers on SQLite.
+Buckets are UTC dates; weeks start on Monday.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Date, DateTime
+
+
+class _DateBucket(FunctionElement):
+    type = Date()
+    inherit_cache = True
+    unit: str
+
+
+class day_bucket(_DateBucket):
+    inherit_cache = True
+    unit = "day"
+
+
+class week_bucket(_DateBucket):
+    inherit_cache = True
+    unit = "week"
+
+
+class month_bucket(_DateBucket):
+    inherit_cache = True
+    unit = "month"
+
+
+BUCKETS = {cls.unit: cls for cls in (day_bucket, week_bucket, month_bucket)}
+
+_SQLITE_MODIFIERS = {
+    "day": (),
+    # back 6 days, then forward to the next Monday (same day if already Monday)
+    "week": ("-6 days", "weekday 1"),
+    "month": ("start of month",),
+}
+
+
+@compiles(_DateBucket)
+def _compile_default(element, compiler, **kw):
+    raise CompileError(f"date buckets are not implemented for {compiler.dialect.name}")
+
+
+@compiles(_DateBucket, "sqlite")
+def _compile_sqlite(element, compiler, **kw):
+    args = [compiler.process(element.clauses, **kw)]
+    args += [f"'{modifier}'" for modifier in _SQLITE_MODIFIERS[element.unit]]
+    return f"date({', '.join(args)})"
+
+
+@compiles(_DateBucket, "postgresql")
+def _compile_postgresql(element, compiler, **kw):
+    (expr,) = element.clauses
+    sql = compiler.process(expr, **kw)
+    if isinstance(expr.type, DateTime) and expr.type.timezone:
+        # timestamptz truncates in the session time zone; pin it to UTC like SQLite
+        sql = f"({sql} AT TIME ZONE 'UTC')"
+    return f"CAST(date_trunc('{element.unit}', {sql}) AS DATE)"
+
+
+def bucket_start(d: date, unit: str) -> date:
+    """Python counterpart of the SQL buckets, for zero-filling gaps."""
+    if unit == "week":
+        return d - timedelta(days=d.weekday())
+    if unit == "month":
+        return d.replace(day=1)
+    return d
+
+
+def next_bucket(d: date, unit: str) -> date:
+    """Start of the bucket after the one starting at `d`."""
+    if unit == "week":
+        return d + timedelta(days=7)
+    if unit == "month":
+        return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+    return d + timedelta(days=1)
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def day_range(d: date) -> tuple[datetime, datetime]:
+    """Half-open [start, end) UTC bounds of a calendar day."""
+    start = datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def month_range(year: int, month: int) -> tuple[datetime, datetime]:
+    """Half-open [start, end) UTC bounds of a calendar month."""
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
@@ -0,0 +1,107 @@
+"""
+Copies a whole exercise + set tree between templates and sessions in a
+fixed number of statements, whatever its size. Callers commit.
+"""
+from sqlalchemy import insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.workout_exercise import WorkoutExercise
+from app.models.workout_set import WorkoutSet
+from app.models.workout_template_exercise import WorkoutTemplateExercise
+from app.models.workout_template_set import WorkoutTemplateSet
+
+
+async def copy_template_into_session(
+    db: AsyncSession, template_id: int, session_id: int, user_id: int
+) -> None:
+    """Two INSERT ... SELECTs; new rows keep their source_template_* links."""
+    await db.execute(
+        insert(WorkoutExercise).from_select(
+            ["session_id", "user_id", "exercise_id", "name", "order_index", "source_template_exercise_id"],
+            select(
+                literal(session_id),
+                literal(user_id),
+                WorkoutTemplateExercise.exercise_id,
+                WorkoutTemplateExercise.name,
+                WorkoutTemplateExercise.order_index,
+                WorkoutTemplateExercise.id,
+            ).where(WorkoutTemplateExercise.template_id == template_id),
+        )
+    )
+
+    # The source link on the new exercises maps each template set to its parent.
+    await db.execute(
+        insert(WorkoutSet).from_select(
+            ["exercise_id", "user_id", "set_number", "reps", "weight_kg", "source_template_set_id"],
+            select(
+                WorkoutExercise.id,
+                literal(user_id),
+                WorkoutTemplateSet.set_number,
+                WorkoutTemplateSet.reps,
+                WorkoutTemplateSet.weight_kg,
+                WorkoutTemplateSet.id,
+            )
+            .join(
+                WorkoutExercise,
+                WorkoutExercise.source_template_exercise_id == WorkoutTemplateSet.template_exercise_id,
+            )
+            .where(WorkoutExercise.session_id == session_id),
+        )
+    )
+
+
+async def copy_session_into_template(db: AsyncSession, session_id: int, template_id: int) -> int:
+    """
+    Template rows have no link back to the session, so the new exercise ids
+    come from a bulk INSERT ... RETURNING in parameter order. Returns the
+    number of exercises copied.
+
+    Postgres batches that insert; SQLite has no ordering sentinel for it, so
+    SQLAlchemy falls back to one in-process statement per exercise there.
+    """
+    ex_res = await db.execute(
+        select(
+            WorkoutExercise.id,
+            WorkoutExercise.exercise_id,
+            WorkoutExercise.name,
+            WorkoutExercise.order_index,
+        )
+        .where(WorkoutExercise.session_id == session_id)
+        .order_by(WorkoutExercise.order_index.asc(), WorkoutExercise.id.asc())
+    )
+    exercises = ex_res.all()
+    if not exercises:
+        return 0
+
+    new_ids = await db.scalars(
+        insert(WorkoutTemplateExercise).returning(WorkoutTemplateExercise.id, sort_by_parameter_order=True),
+        [
+            {
+                "template_id": template_id,
+                "exercise_id": ex.exercise_id,
+                "name": ex.name,
+                "order_index": ex.order_index,
+            }
+            for ex in exercises
+        ],
+    )
+    template_exercise_ids = dict(zip((ex.id for ex in exercises), new_ids.all()))
+
+    set_res = await db.execute(
+        select(WorkoutSet.exercise_id, WorkoutSet.set_number, WorkoutSet.reps, WorkoutSet.weight_kg)
+        .where(WorkoutSet.exercise_id.in_(template_exercise_ids))
+        .order_by(WorkoutSet.exercise_id.asc(), WorkoutSet.set_number.asc(), WorkoutSet.id.asc())
+    )
+    template_sets = [
+        {
+            "template_exercise_id": template_exercise_ids[s.exercise_id],
+            "set_number": s.set_number,
+            "reps": s.reps,
+            "weight_kg": s.weight_kg,
+        }
+        for s in set_res.all()
+    ]
+    if template_sets:
+        await db.execute(insert(WorkoutTemplateSet), template_sets)
+
+    return len(exercises)
@@ -0,0 +1,439 @@
+"""
+Per-user rollups over finished sessions, maintained in the same transaction
+as the write that changes them so analytics read a handful of rows instead
+of scanning sets:
+
+- WorkoutDailyStats / WorkoutDailyExerciseStats: totals per UTC day
+- UserExerciseStats: all-time bests and totals per catalog exercise
+- ExerciseSessionSummary: one row per catalog exercise per session, for timelines
+
+Daily rollups are applied as signed deltas computed from the rows about to
+be added or removed: finishing a session adds its contribution, deleting
+sessions or purging exercises subtracts theirs. Deltas are upserts that
+increment the stored counters, so concurrent writers don't lose updates.
+Rows that drop to zero are removed. Set edits need no hook: they are only
+allowed on the active session, which has no contribution yet.
+
+Exercise stats merge a finished session in the same way, but a maximum
+can't be decremented, so removals recompute the affected exercises from the
+history that remains. Session summaries are written on finish and rewritten
+for the affected sessions on removal.
+
+rebuild_user() recomputes a user from scratch; app.commands.rebuild_workout_stats
+reconciles every user.
+"""
+import math
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import case, delete, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.timebuckets import day_bucket
+from app.models.exercise_session_summary import ExerciseSessionSummary
+from app.models.user_exercise_stats import UserExerciseStats
+from app.models.workout_daily_stats import WorkoutDailyExerciseStats, WorkoutDailyStats
+from app.models.workout_exercise import WorkoutExercise
+from app.models.workout_session import WorkoutSession
+from app.models.workout_set import WorkoutSet
+
+_COUNTERS = ("sessions", "sets", "reps", "volume")
+_EXERCISE_STATS = (
+    "best_weight_kg",
+    "best_weight_reps",
+    "best_weight_at",
+    "best_e1rm_kg",
+    "total_volume",
+    "sessions_count",
+    "last_performed_at",
+    "last_workout_exercise_id",
+)
+_SUMMARY = ("ended_at", "top_weight_kg", "top_set_reps", "volume", "total_reps", "sets", "e1rm_kg")
+
+
+def _insert(db: AsyncSession):
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+
+def _e1rm(weight_kg: float, reps: int) -> float:
+    """Epley estimate; callers skip sets without reps."""
+    return weight_kg * (1 + reps / 30)
+
+
+async def _contributions(db: AsyncSession, session_where, set_where) -> tuple[dict, dict]:
+    """
+    Totals of the matching finished sessions and performed sets, as
+    {day: counters} and {(day, exercise_id): counters}.
+    """
+    days: dict[date, dict] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    exercises: dict[tuple[date, int], dict] = {}
+
+    if session_where is not None:
+        day = day_bucket(WorkoutSession.ended_at)
+        res = await db.execute(
+            select(day.label("day"), func.count(WorkoutSession.id).label("sessions"))
+            .where(
+                WorkoutSession.status == "finished",
+                WorkoutSession.ended_at.isnot(None),
+                *session_where,
+            )
+            .group_by(day)
+        )
+        for r in res.all():
+            days[r.day]["sessions"] += r.sessions
+
+    day = day_bucket(WorkoutSet.performed_at)
+    res = await db.execute(
+        select(
+            day.label("day"),
+            WorkoutExercise.exercise_id,
+            func.count(WorkoutSet.id).label("sets"),
+            func.coalesce(func.sum(WorkoutSet.reps), 0).label("reps"),
+            func.coalesce(
+                func.sum(func.coalesce(WorkoutSet.weight_kg, 0) * func.coalesce(WorkoutSet.reps, 0)), 0
+            ).label("volume"),
+        )
+        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
+        .where(WorkoutSet.performed_at.isnot(None), *set_where)
+        .group_by(day, WorkoutExercise.exercise_id)
+    )
+    for r in res.all():
+        totals = days[r.day]
+        totals["sets"] += r.sets
+        totals["reps"] += int(r.reps)
+        totals["volume"] += float(r.volume)
+        # Sets under names that never made it into the catalog only count toward the day
+        if r.exercise_id is not None:
+            exercises[(r.day, r.exercise_id)] = {"sets": r.sets, "reps": int(r.reps), "volume": float(r.volume)}
+
+    return dict(days), exercises
+
+
+async def _apply(db: AsyncSession, user_id: int, days: dict, exercises: dict, sign: int) -> None:
+    insert = _insert(db)
+    if days:
+        stmt = insert(WorkoutDailyStats)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "day"],
+                set_={c: getattr(WorkoutDailyStats, c) + getattr(stmt.excluded, c) for c in _COUNTERS},
+            ),
+            [
+                {"user_id": user_id, "day": d, **{c: sign * v for c, v in totals.items()}}
+                for d, totals in days.items()
+            ],
+        )
+    if exercises:
+        stmt = insert(WorkoutDailyExerciseStats)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "day", "exercise_id"],
+                set_={c: getattr(WorkoutDailyExerciseStats, c) + getattr(stmt.excluded, c) for c in _COUNTERS[1:]},
+            ),
+            [
+                {"user_id": user_id, "day": d, "exercise_id": ex_id, **{c: sign * v for c, v in totals.items()}}
+                for (d, ex_id), totals in exercises.items()
+            ],
+        )
+    if sign < 0:
+        await db.execute(
+            delete(WorkoutDailyStats).where(
+                WorkoutDailyStats.user_id == user_id,
+                WorkoutDailyStats.sessions <= 0,
+                WorkoutDailyStats.sets <= 0,
+            )
+        )
+        await db.execute(
+            delete(WorkoutDailyExerciseStats).where(
+                WorkoutDailyExerciseStats.user_id == user_id,
+                WorkoutDailyExerciseStats.sets <= 0,
+            )
+        )
+
+
+async def _exercise_stats(db: AsyncSession, *where) -> dict[int, dict]:
+    """UserExerciseStats values per catalog exercise over the matching performed exercises."""
+    res = await db.execute(
+        select(
+            WorkoutExercise.id,
+            WorkoutExercise.exercise_id,
+            WorkoutExercise.session_id,
+            WorkoutExercise.performed_at,
+            WorkoutSet.weight_kg,
+            WorkoutSet.reps,
+        )
+        .outerjoin(WorkoutSet, WorkoutSet.exercise_id == WorkoutExercise.id)
+        .where(
+            WorkoutExercise.performed_at.isnot(None),
+            WorkoutExercise.exercise_id.isnot(None),
+            *where,
+        )
+    )
+
+    stats: dict[int, dict] = {}
+    sessions: dict[int, set[int]] = defaultdict(set)
+    for r in res.all():
+        st = stats.get(r.exercise_id)
+        if st is None:
+            st = stats[r.exercise_id] = dict.fromkeys(_EXERCISE_STATS)
+            st["total_volume"] = 0.0
+        sessions[r.exercise_id].add(r.session_id)
+        if st["last_performed_at"] is None or r.performed_at > st["last_performed_at"]:
+            st["last_performed_at"] = r.performed_at
+        st["last_workout_exercise_id"] = max(st["last_workout_exercise_id"] or 0, r.id)
+
+        if r.weight_kg is None:
+            continue
+        reps = r.reps or 0
+        st["total_volume"] += r.weight_kg * reps
+        best = (st["best_weight_kg"], st["best_weight_at"], st["best_weight_reps"] or 0)
+        if st["best_weight_kg"] is None or (r.weight_kg, r.performed_at, reps) > best:
+            st["best_weight_kg"], st["best_weight_at"], st["best_weight_reps"] = r.weight_kg, r.performed_at, r.reps
+        if reps > 0:
+            e1rm = _e1rm(r.weight_kg, reps)
+            if st["best_e1rm_kg"] is None or e1rm > st["best_e1rm_kg"]:
+                st["best_e1rm_kg"] = e1rm
+
+    for exercise_id, st in stats.items():
+        st["sessions_count"] = len(sessions[exercise_id])
+    return stats
+
+
+def _exercise_stats_rows(user_id: int, stats: dict[int, dict]) -> list[dict]:
+    return [{"user_id": user_id, "exercise_id": ex_id, **st} for ex_id, st in stats.items()]
+
+
+async def _merge_exercise_stats(db: AsyncSession, user_id: int, stats: dict[int, dict]) -> None:
+    """Folds one newly finished session's stats into the stored ones."""
+    if not stats:
+        return
+    t = UserExerciseStats
+    stmt = _insert(db)(t)
+    new = stmt.excluded
+    heavier = or_(t.best_weight_kg.is_(None), new.best_weight_kg >= t.best_weight_kg)
+    newer = or_(t.last_performed_at.is_(None), new.last_performed_at >= t.last_performed_at)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "exercise_id"],
+            set_={
+                "best_weight_kg": case((heavier, new.best_weight_kg), else_=t.best_weight_kg),
+                "best_weight_reps": case((heavier, new.best_weight_reps), else_=t.best_weight_reps),
+                "best_weight_at": case((heavier, new.best_weight_at), else_=t.best_weight_at),
+                "best_e1rm_kg": case(
+                    (or_(t.best_e1rm_kg.is_(None), new.best_e1rm_kg > t.best_e1rm_kg), new.best_e1rm_kg),
+                    else_=t.best_e1rm_kg,
+                ),
+                "total_volume": t.total_volume + new.total_volume,
+                "sessions_count": t.sessions_count + new.sessions_count,
+                "last_performed_at": case((newer, new.last_performed_at), else_=t.last_performed_at),
+                "last_workout_exercise_id": case(
+                    (newer, new.last_workout_exercise_id), else_=t.last_workout_exercise_id
+                ),
+            },
+        ),
+        _exercise_stats_rows(user_id, stats),
+    )
+
+
+async def _recompute_exercise_stats(db: AsyncSession, user_id: int, exclude) -> None:
+    """Recomputes the exercises touched by the `exclude`d rows as if those were already gone."""
+    res = await db.execute(
+        select(WorkoutExercise.exercise_id)
+        .where(WorkoutExercise.user_id == user_id, WorkoutExercise.exercise_id.isnot(None), exclude)
+        .distinct()
+    )
+    exercise_ids = res.scalars().all()
+    if not exercise_ids:
+        return
+
+    stats = await _exercise_stats(
+        db,
+        WorkoutExercise.user_id == user_id,
+        WorkoutExercise.exercise_id.in_(exercise_ids),
+        ~exclude,
+    )
+    await db.execute(
+        delete(UserExerciseStats).where(
+            UserExerciseStats.user_id == user_id,
+            UserExerciseStats.exercise_id.in_(exercise_ids),
+        )
+    )
+    if stats:
+        await db.execute(_insert(db)(UserExerciseStats), _exercise_stats_rows(user_id, stats))
+
+
+async def _session_summaries(db: AsyncSession, *where) -> dict[tuple[int, int], dict]:
+    """ExerciseSessionSummary values per (session_id, exercise_id) over the matching performed sets."""
+    res = await db.execute(
+        select(
+            WorkoutExercise.session_id,
+            WorkoutExercise.exercise_id,
+            WorkoutExercise.performed_at,
+            WorkoutSet.weight_kg,
+            WorkoutSet.reps,
+        )
+        .join(WorkoutSet, WorkoutSet.exercise_id == WorkoutExercise.id)
+        .where(
+            WorkoutExercise.performed_at.isnot(None),
+            WorkoutExercise.exercise_id.isnot(None),
+            *where,
+        )
+    )
+
+    summaries: dict[tuple[int, int], dict] = {}
+    for r in res.all():
+        sm = summaries.get((r.session_id, r.exercise_id))
+        if sm is None:
+            sm = summaries[(r.session_id, r.exercise_id)] = dict.fromkeys(_SUMMARY)
+            sm.update(ended_at=r.performed_at, volume=0.0, total_reps=0, sets=0)
+        reps = r.reps or 0
+        sm["sets"] += 1
+        sm["total_reps"] += reps
+        if r.weight_kg is None:
+            continue
+        sm["volume"] += r.weight_kg * reps
+        if sm["top_weight_kg"] is None or (r.weight_kg, reps) > (sm["top_weight_kg"], sm["top_set_reps"] or 0):
+            sm["top_weight_kg"], sm["top_set_reps"] = r.weight_kg, r.reps
+        if reps > 0 and (sm["e1rm_kg"] is None or _e1rm(r.weight_kg, reps) > sm["e1rm_kg"]):
+            sm["e1rm_kg"] = _e1rm(r.weight_kg, reps)
+    return summaries
+
+
+async def _insert_session_summaries(db: AsyncSession, user_id: int, summaries: dict) -> None:
+    if summaries:
+        await db.execute(
+            _insert(db)(ExerciseSessionSummary),
+            [
+                {"user_id": user_id, "session_id": session_id, "exercise_id": ex_id, **sm}
+                for (session_id, ex_id), sm in summaries.items()
+            ],
+        )
+
+
+async def _rewrite_session_summaries(db: AsyncSession, user_id: int, exclude) -> None:
+    """Rewrites the summaries of sessions touched by the `exclude`d rows as if those were already gone."""
+    session_ids = select(WorkoutExercise.session_id).where(WorkoutExercise.user_id == user_id, exclude)
+    summaries = await _session_summaries(db, WorkoutExercise.session_id.in_(session_ids), ~exclude)
+    await db.execute(
+        delete(ExerciseSessionSummary).where(
+            ExerciseSessionSummary.user_id == user_id,
+            ExerciseSessionSummary.session_id.in_(session_ids),
+        )
+    )
+    await _insert_session_summaries(db, user_id, summaries)
+
+
+async def add_finished_session(db: AsyncSession, session: WorkoutSession) -> None:
+    """Call once the session and its sets carry their finish time, before commit."""
+    days, exercises = await _contributions(
+        db,
+        [WorkoutSession.id == session.id],
+        [WorkoutExercise.session_id == session.id],
+    )
+    await _apply(db, session.user_id, days, exercises, 1)
+    await _merge_exercise_stats(
+        db, session.user_id, await _exercise_stats(db, WorkoutExercise.session_id == session.id)
+    )
+    await _insert_session_summaries(
+        db, session.user_id, await _session_summaries(db, WorkoutExercise.session_id == session.id)
+    )
+
+
+async def remove_sessions(db: AsyncSession, user_id: int, session_ids: list[int]) -> None:
+    """Call before the sessions' rows are deleted."""
+    days, exercises = await _contributions(
+        db,
+        [WorkoutSession.id.in_(session_ids)],
+        [WorkoutExercise.session_id.in_(session_ids)],
+    )
+    await _apply(db, user_id, days, exercises, -1)
+    await _recompute_exercise_stats(db, user_id, WorkoutExercise.session_id.in_(session_ids))
+    await _rewrite_session_summaries(db, user_id, WorkoutExercise.session_id.in_(session_ids))
+
+
+async def remove_exercises(db: AsyncSession, user_id: int, workout_exercise_ids: list[int]) -> None:
+    """Call before the exercises' sets are deleted; their sessions still count."""
+    days, exercises = await _contributions(db, None, [WorkoutExercise.id.in_(workout_exercise_ids)])
+    await _apply(db, user_id, days, exercises, -1)
+    await _recompute_exercise_stats(db, user_id, WorkoutExercise.id.in_(workout_exercise_ids))
+    await _rewrite_session_summaries(db, user_id, WorkoutExercise.id.in_(workout_exercise_ids))
+
+
+async def clear_user(db: AsyncSession, user_id: int) -> None:
+    await db.execute(delete(WorkoutDailyStats).where(WorkoutDailyStats.user_id == user_id))
+    await db.execute(delete(WorkoutDailyExerciseStats).where(WorkoutDailyExerciseStats.user_id == user_id))
+    await db.execute(delete(UserExerciseStats).where(UserExerciseStats.user_id == user_id))
+    await db.execute(delete(ExerciseSessionSummary).where(ExerciseSessionSummary.user_id == user_id))
+
+
+async def _expected(db: AsyncSession, user_id: int) -> tuple[dict, dict, dict, dict]:
+    days, exercises = await _contributions(
+        db, [WorkoutSession.user_id == user_id], [WorkoutSet.user_id == user_id]
+    )
+    return (
+        days,
+        exercises,
+        await _exercise_stats(db, WorkoutExercise.user_id == user_id),
+        await _session_summaries(db, WorkoutExercise.user_id == user_id),
+    )
+
+
+async def rebuild_user(db: AsyncSession, user_id: int) -> None:
+    """Recomputes the user's rollups from their history. The caller commits."""
+    days, exercises, exercise_stats, summaries = await _expected(db, user_id)
+    await clear_user(db, user_id)
+    await _apply(db, user_id, days, exercises, 1)
+    if exercise_stats:
+        await db.execute(_insert(db)(UserExerciseStats), _exercise_stats_rows(user_id, exercise_stats))
+    await _insert_session_summaries(db, user_id, summaries)
+
+
+def _equal(a, b) -> bool:
+    if isinstance(a, float) and isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+    return a == b
+
+
+def _same(a: dict, b: dict) -> bool:
+    return a.keys() == b.keys() and all(all(_equal(a[k][c], b[k][c]) for c in a[k]) for k in a)
+
+
+async def user_is_consistent(db: AsyncSession, user_id: int) -> bool:
+    """Whether the stored rollups match a recomputation from history."""
+    days, exercises, exercise_stats, summaries = await _expected(db, user_id)
+
+    res = await db.execute(
+        select(WorkoutDailyStats.day, *(getattr(WorkoutDailyStats, c) for c in _COUNTERS)).where(
+            WorkoutDailyStats.user_id == user_id
+        )
+    )
+    stored_days = {r.day: {c: r._mapping[c] for c in _COUNTERS} for r in res.all()}
+    res = await db.execute(
+        select(
+            WorkoutDailyExerciseStats.day,
+            WorkoutDailyExerciseStats.exercise_id,
+            *(getattr(WorkoutDailyExerciseStats, c) for c in _COUNTERS[1:]),
+        ).where(WorkoutDailyExerciseStats.user_id == user_id)
+    )
+    stored_exercises = {(r.day, r.exercise_id): {c: r._mapping[c] for c in _COUNTERS[1:]} for r in res.all()}
+    res = await db.execute(
+        select(UserExerciseStats.exercise_id, *(getattr(UserExerciseStats, c) for c in _EXERCISE_STATS)).where(
+            UserExerciseStats.user_id == user_id
+        )
+    )
+    stored_exercise_stats = {r.exercise_id: {c: r._mapping[c] for c in _EXERCISE_STATS} for r in res.all()}
+    res = await db.execute(
+        select(
+            ExerciseSessionSummary.session_id,
+            ExerciseSessionSummary.exercise_id,
+            *(getattr(ExerciseSessionSummary, c) for c in _SUMMARY),
+        ).where(ExerciseSessionSummary.user_id == user_id)
+    )
+    stored_summaries = {(r.session_id, r.exercise_id): {c: r._mapping[c] for c in _SUMMARY} for r in res.all()}
+    return (
+        _same(days, stored_days)
+        and _same(exercises, stored_exercises)
+        and _same(exercise_stats, stored_exercise_stats)
+        and _same(summaries, stored_summaries)
+    )
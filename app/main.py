@@ -1,12 +1,51 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, engine, optimize_sqlite, read_engine, warm_up_engine
+from app.core.hashing import password_hasher
+from app.core.instrumentation import QueryStatsMiddleware, instrument_engine
+from app.core.log import REQUEST_ID_HEADER, RequestIdMiddleware, configure_logging, shutdown_logging
+from app.core.read_after_write import LAST_WRITE_HEADER, ReadAfterWriteMiddleware
+from app.core.refresh_tokens import load_revoked_families
 from app.routers.auth import router as auth_router
+from app.routers.internal import router as internal_router
 from app.routers.me import router as me_router
 from app.routers.nutrition import router as nutrition_router
 from app.routers.workouts import router as workouts_router
 from fastapi.middleware.cors import CORSMiddleware
 
 
-app = FastAPI(title="Gym App API v2")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+    await warm_up_engine(engine, settings.DB_POOL_WARMUP)
+    if read_engine is not None:
+        await warm_up_engine(read_engine, settings.DB_POOL_WARMUP)
+    await password_hasher.configure_cost()
+    async with AsyncSessionLocal() as db:
+        await load_revoked_families(db)
+    yield
+    password_hasher.shutdown()
+    await optimize_sqlite(engine)
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+    shutdown_logging()
+
+
+app = FastAPI(title="Gym App API v2", lifespan=lifespan)
+
+if settings.SQL_INSTRUMENTATION:
+    instrument_engine(engine)
+    if read_engine is not None:
+        instrument_engine(read_engine)
+    app.add_middleware(QueryStatsMiddleware)
+
+if read_engine is not None:
+    app.add_middleware(ReadAfterWriteMiddleware)
+
+app.add_middleware(RequestIdMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +59,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Query-Count", "X-N-Plus-One", "Server-Timing", "ETag", REQUEST_ID_HEADER, LAST_WRITE_HEADER],
 )
 
 
@@ -28,6 +68,7 @@ app.include_router(auth_router)
 app.include_router(me_router)
 app.include_router(nutrition_router)
 app.include_router(workouts_router)
+app.include_router(internal_router)
 
 
 
@@ -1,8 +1,14 @@
 from .user import User  # noqa
 from .food_entry import FoodEntry  # noqa
+from .nutrition_daily_totals import NutritionDailyTotals  # noqa
+from .exercise import Exercise, ExerciseAlias  # noqa
 from .workout_session import WorkoutSession  # noqa
 from .workout_exercise import WorkoutExercise  # noqa
 from .workout_set import WorkoutSet  # noqa
+from .workout_daily_stats import WorkoutDailyStats, WorkoutDailyExerciseStats  # noqa
+from .user_exercise_stats import UserExerciseStats  # noqa
+from .exercise_session_summary import ExerciseSessionSummary  # noqa
 from .workout_template import WorkoutTemplate  # noqa
 from .workout_template_exercise import WorkoutTemplateExercise  # noqa
-
+from .workout_template_set import WorkoutTemplateSet  # noqa
+from .refresh_token import RefreshToken  # noqa
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class Exercise(Base):
+    """Per-user exercise catalog; workout and template exercises point here."""
+
+    __tablename__ = "exercises"
+    __table_args__ = (
+        UniqueConstraint("user_id", "normalized_name", name="uq_exercises_user_normalized_name"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Display name, as first entered
+    name: Mapped[str] = mapped_column(String(120), nullable=False)
+    # See normalize_exercise_name()
+    normalized_name: Mapped[str] = mapped_column(String(120), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class ExerciseAlias(Base):
+    """Other names that resolve to a catalog exercise, e.g. left behind by a merge."""
+
+    __tablename__ = "exercise_aliases"
+    __table_args__ = (
+        UniqueConstraint("user_id", "normalized_name", name="uq_exercise_aliases_user_normalized_name"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    normalized_name: Mapped[str] = mapped_column(String(120), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
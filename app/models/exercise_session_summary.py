@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class ExerciseSessionSummary(Base):
+    """
+    One row per catalog exercise per finished session, for per-exercise
+    timelines; see app.core.workout_stats. Only exercises with logged sets
+    get a row. session_id follows ended_at in the key so two sessions
+    ending at the same instant don't collide.
+    """
+
+    __tablename__ = "exercise_session_summary"
+    __table_args__ = (Index("ix_exercise_session_summary_session", "session_id"),)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    ended_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    session_id: Mapped[int] = mapped_column(
+        ForeignKey("workout_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    top_weight_kg: Mapped[float | None] = mapped_column(Float, nullable=True)
+    top_set_reps: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    volume: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    total_reps: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sets: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    e1rm_kg: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -1,15 +1,18 @@
-from sqlalchemy import String, Date, DateTime, Integer, Float, ForeignKey, func
+from sqlalchemy import String, Date, DateTime, Integer, Float, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
 
 class FoodEntry(Base):
     __tablename__ = "food_entries"
+    __table_args__ = (
+        Index("ix_food_entries_user_date", "user_id", "date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
 
-    date: Mapped[str] = mapped_column(Date, index=True, nullable=False)
+    date: Mapped[str] = mapped_column(Date, nullable=False)
     date_time: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     meal_type: Mapped[str] = mapped_column(String(20), nullable=False)  # breakfast/lunch/dinner/snacks
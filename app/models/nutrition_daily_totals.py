@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import date
+from sqlalchemy import Date, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class NutritionDailyTotals(Base):
+    """Per-user, per-day sums of food_entries; see app.core.nutrition_totals."""
+
+    __tablename__ = "nutrition_daily_totals"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # Rows are dropped when the last entry of the day goes
+    entries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    calories: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    protein_g: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    carbs_g: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    fat_g: Mapped[float] = mapped_column(Float, nullable=False, default=0)
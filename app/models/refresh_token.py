@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    # `jti` claim of the issued token
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+
+    # All tokens rotated from the same login share a family; reuse of any
+    # already-rotated token revokes the whole family.
+    family_id: Mapped[str] = mapped_column(String(32), index=True, nullable=False)
+
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
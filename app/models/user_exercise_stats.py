@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import DateTime, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class UserExerciseStats(Base):
+    """All-time bests and totals per catalog exercise over finished sessions; see app.core.workout_stats."""
+
+    __tablename__ = "user_exercise_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # Heaviest set; on ties the most recent one (then the most reps)
+    best_weight_kg: Mapped[float | None] = mapped_column(Float, nullable=True)
+    best_weight_reps: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    best_weight_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Epley: weight * (1 + reps / 30)
+    best_e1rm_kg: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    total_volume: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    sessions_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_performed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Newest WorkoutExercise row, the id /analytics/exercises hands out
+    last_workout_exercise_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import date
+from sqlalchemy import Date, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class WorkoutDailyStats(Base):
+    """Per-user, per-UTC-day totals over finished sessions; see app.core.workout_stats."""
+
+    __tablename__ = "workout_daily_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    sessions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sets: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reps: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    volume: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+
+
+class WorkoutDailyExerciseStats(Base):
+    """The same totals split by catalog exercise."""
+
+    __tablename__ = "workout_daily_exercise_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    exercise_id: Mapped[int] = mapped_column(
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    sets: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reps: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    volume: Mapped[float] = mapped_column(Float, nullable=False, default=0)
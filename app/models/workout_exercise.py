@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,15 +9,32 @@ from app.core.db import Base
 
 class WorkoutExercise(Base):
     __tablename__ = "workout_exercises"
+    __table_args__ = (
+        Index("ix_workout_exercises_session_order", "session_id", "order_index"),
+        Index("ix_workout_exercises_user_performed", "user_id", "performed_at"),
+        Index("ix_workout_exercises_exercise_id", "exercise_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     session_id: Mapped[int] = mapped_column(
         ForeignKey("workout_sessions.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
 
+    # Copied from the session so analytics can skip the join:
+    # performed_at is the session's ended_at, NULL while it is still active.
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    performed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     name: Mapped[str] = mapped_column(String(120), nullable=False)  # e.g. Bench Press
+    # Catalog entry for `name`; NULL only for rows the catalog backfill hasn't reached yet
+    exercise_id: Mapped[int | None] = mapped_column(
+        ForeignKey("exercises.id", ondelete="SET NULL"),
+        nullable=True,
+    )
     order_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     # If this exercise was created from a template, store the template exercise id
@@ -26,3 +43,7 @@ class WorkoutExercise(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
+
+
+# Case-insensitive name lookups (purge_exercise_history)
+Index("ix_workout_exercises_lower_name", func.lower(WorkoutExercise.name))
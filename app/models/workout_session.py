@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,13 +9,23 @@ from app.core.db import Base
 
 class WorkoutSession(Base):
     __tablename__ = "workout_sessions"
+    __table_args__ = (
+        # user_id + status filters, (ended_at, id) range/ordering for history keyset pages and analytics
+        Index("ix_workout_sessions_user_status_ended_id", "user_id", "status", "ended_at", "id"),
+        # Partial: only the (few) active rows, for the per-request active-session lookup
+        Index(
+            "ix_workout_sessions_user_active",
+            "user_id",
+            sqlite_where=text("status = 'active'"),
+            postgresql_where=text("status = 'active'"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
 
@@ -30,7 +40,6 @@ class WorkoutSession(Base):
         String(20),
         nullable=False,
         default="active",
-        index=True,
     )
 
     started_at: Mapped[datetime] = mapped_column(
@@ -66,3 +75,11 @@ class WorkoutSession(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+
+    # Bumped by every write to the session or its exercises and sets; feeds the ETag
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+    )
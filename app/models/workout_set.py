@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,15 +9,25 @@ from app.core.db import Base
 
 class WorkoutSet(Base):
     __tablename__ = "workout_sets"
+    __table_args__ = (
+        Index("ix_workout_sets_exercise_set_number", "exercise_id", "set_number"),
+        Index("ix_workout_sets_user_performed", "user_id", "performed_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     exercise_id: Mapped[int] = mapped_column(
         ForeignKey("workout_exercises.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
 
+    # Copied from the session, see WorkoutExercise
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    performed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     set_number: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
     reps: Mapped[int | None] = mapped_column(Integer, nullable=True)
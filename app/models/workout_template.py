@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,12 +9,14 @@ from app.core.db import Base
 
 class WorkoutTemplate(Base):
     __tablename__ = "workout_templates"
+    __table_args__ = (
+        Index("ix_workout_templates_user_created", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
 
@@ -26,3 +28,11 @@ class WorkoutTemplate(Base):
         nullable=False,
         server_default=func.now(),
     )
+
+    # Bumped by every write to the template or its exercises; feeds the ETag
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+    )
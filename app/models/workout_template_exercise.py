@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,16 +9,24 @@ from app.core.db import Base
 
 class WorkoutTemplateExercise(Base):
     __tablename__ = "workout_template_exercises"
+    __table_args__ = (
+        Index("ix_workout_template_exercises_template_order", "template_id", "order_index"),
+        Index("ix_workout_template_exercises_exercise_id", "exercise_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     template_id: Mapped[int] = mapped_column(
         ForeignKey("workout_templates.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
 
     name: Mapped[str] = mapped_column(String(120), nullable=False)
+    # See WorkoutExercise.exercise_id
+    exercise_id: Mapped[int | None] = mapped_column(
+        ForeignKey("exercises.id", ondelete="SET NULL"),
+        nullable=True,
+    )
     order_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
     created_at: Mapped[datetime] = mapped_column(
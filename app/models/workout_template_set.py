@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, Float, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Float, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -9,12 +9,14 @@ from app.core.db import Base
 
 class WorkoutTemplateSet(Base):
     __tablename__ = "workout_template_sets"
+    __table_args__ = (
+        Index("ix_workout_template_sets_exercise_set_number", "template_exercise_id", "set_number"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     template_exercise_id: Mapped[int] = mapped_column(
         ForeignKey("workout_template_exercises.id", ondelete="CASCADE"),
-        index=True,
         nullable=False,
     )
 
@@ -1,15 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.core.security import (
-    hash_password,
-    verify_password,
-    create_access_token,
-    create_refresh_token,
-    decode_token,
-)
+from app.core.db import AsyncSessionLocal, get_db
+from app.core.hashing import password_hasher
+from app.core.principals import invalidate_principal
+from app.core.refresh_tokens import issue_refresh_token, revoke_family, rotate_refresh_token
+from app.core.security import InvalidToken, token_service
 from app.models.user import User
 from app.schemas.auth import RegisterRequest, LoginRequest, RefreshRequest, TokenPair
 
@@ -25,50 +22,98 @@ async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db))
             detail="Email already registered",
         )
 
-    user = User(email=payload.email, password_hash=hash_password(payload.password))
+    password_hash = await password_hasher.hash(payload.password)
+    user = User(email=payload.email, password_hash=password_hash)
     db.add(user)
+    await db.flush()
+    refresh_token = issue_refresh_token(db, user.id)
     await db.commit()
-    await db.refresh(user)
+    invalidate_principal(user.id)
 
     return TokenPair(
-        access_token=create_access_token(user.id),
-        refresh_token=create_refresh_token(user.id),
+        access_token=token_service.create_access_token(user.id),
+        refresh_token=refresh_token,
     )
 
 
+async def _rehash_password(user_id: int, old_hash: str, password: str) -> None:
+    try:
+        new_hash = await password_hasher.hash(password)
+    except HTTPException:
+        # Pool is saturated; the hash gets upgraded on a later login instead.
+        return
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.password_hash == old_hash)
+            .values(password_hash=new_hash)
+        )
+        await db.commit()
+
+
 @router.post("/login", response_model=TokenPair)
-async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
+async def login(
+    payload: LoginRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
     res = await db.execute(select(User).where(User.email == payload.email))
     user = res.scalar_one_or_none()
 
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await password_hasher.verify(payload.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
 
+    if password_hasher.needs_rehash(user.password_hash):
+        background_tasks.add_task(_rehash_password, user.id, user.password_hash, payload.password)
+
+    refresh_token = issue_refresh_token(db, user.id)
+    await db.commit()
+
     return TokenPair(
-        access_token=create_access_token(user.id),
-        refresh_token=create_refresh_token(user.id),
+        access_token=token_service.create_access_token(user.id),
+        refresh_token=refresh_token,
     )
 
-@router.post("/refresh", response_model=TokenPair)
-async def refresh(payload: RefreshRequest):
+
+def _decode_refresh_token(token: str) -> dict:
     try:
-        data = decode_token(payload.refresh_token)
-    except ValueError:
+        data = token_service.decode(token, cache=False)
+    except InvalidToken:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
     if data.get("type") != "refresh":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not a refresh token")
 
-    user_id = int(data["sub"])
+    return data
+
+
+@router.post("/refresh", response_model=TokenPair)
+async def refresh(payload: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    data = _decode_refresh_token(payload.refresh_token)
+
+    try:
+        refresh_token = await rotate_refresh_token(db, data, payload.refresh_token)
+    except InvalidToken:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    await db.commit()
 
     return TokenPair(
-        access_token=create_access_token(user_id),
-        refresh_token=create_refresh_token(user_id),
+        access_token=token_service.create_access_token(int(data["sub"])),
+        refresh_token=refresh_token,
     )
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(payload: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    data = _decode_refresh_token(payload.refresh_token)
+    if data.get("fam"):
+        await revoke_family(db, data["fam"])
+    return
+
+
 
 
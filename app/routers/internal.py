@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends
+
+from app.core.analytics_cache import analytics_cache
+from app.core.db import engine, pool_stats, read_engine
+from app.core.deps import require_internal_token
+from app.core.hashing import password_hasher
+from app.core.principals import principal_cache
+from app.core.security import token_service
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/metrics/password-hashing")
+async def password_hashing_metrics():
+    return password_hasher.stats()
+
+
+@router.get("/metrics/principal-cache")
+async def principal_cache_metrics():
+    return principal_cache.stats()
+
+
+@router.get("/metrics/analytics-cache")
+async def analytics_cache_metrics():
+    return analytics_cache.stats()
+
+
+@router.get("/metrics/token-cache")
+async def token_cache_metrics():
+    return token_service.stats()
+
+
+@router.get("/db/pool")
+async def db_pool_stats():
+    stats = {"primary": pool_stats(engine)}
+    if read_engine is not None:
+        stats["read"] = pool_stats(read_engine)
+    return stats
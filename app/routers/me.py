@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends
 from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.principals import Principal
 from app.schemas.user import UserOut
 
 router = APIRouter(prefix="/me", tags=["me"])
 
 @router.get("", response_model=UserOut)
-async def me(user: User = Depends(get_current_user)):
+async def me(user: Principal = Depends(get_current_user)):
     return UserOut(id=user.id, email=user.email, created_at=user.created_at)
 
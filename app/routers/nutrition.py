@@ -1,21 +1,32 @@
 from datetime import date, timedelta
+from typing import Literal
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, func
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import nutrition_totals
+from app.core.config import settings
 from app.core.db import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.deps import get_current_user, get_read_db, get_token_user
+from app.core.principals import Principal
+from app.core.responses import FastJSONResponse
+from app.core.timebuckets import BUCKETS, bucket_start, next_bucket
 from app.models.food_entry import FoodEntry
+from app.models.nutrition_daily_totals import NutritionDailyTotals
 from app.schemas.nutrition import FoodEntryCreate, FoodEntryUpdate, FoodEntryOut, DayTotals, MealGroup, Last7DaysOut, DayMacroTotals
+from app.schemas.nutrition import NutritionRangeOut, RangeBucketOut
+
+router = APIRouter(prefix="/nutrition", tags=["nutrition"], default_response_class=FastJSONResponse)
 
-router = APIRouter(prefix="/nutrition", tags=["nutrition"])
+_food_entries = TypeAdapter(list[FoodEntryOut])
 
 
 @router.post("/entry", response_model=FoodEntryOut, status_code=201)
 async def create_entry(
     payload: FoodEntryCreate,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     entry = FoodEntry(
@@ -30,26 +41,17 @@ async def create_entry(
         source="manual",
     )
     db.add(entry)
+    await nutrition_totals.add_entry(db, entry)
     await db.commit()
     await db.refresh(entry)
 
-    return FoodEntryOut(
-        id=entry.id,
-        date=entry.date,
-        date_time=entry.date_time,
-        meal_type=entry.meal_type,
-        name=entry.name,
-        calories=entry.calories,
-        protein_g=entry.protein_g,
-        carbs_g=entry.carbs_g,
-        fat_g=entry.fat_g,
-    )
+    return FoodEntryOut.model_validate(entry)
 
 
 @router.get("/day", response_model=DayTotals)
 async def get_day(
     date: date,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -59,41 +61,28 @@ async def get_day(
     )
     entries = res.scalars().all()
 
-    calories = sum(e.calories for e in entries)
-    protein = float(sum(e.protein_g for e in entries))
-    carbs = float(sum(e.carbs_g for e in entries))
-    fat = float(sum(e.fat_g for e in entries))
-
-    order = ["breakfast", "lunch", "dinner", "snacks"]
-    meals: list[MealGroup] = []
-    for mt in order:
-        mt_entries = [e for e in entries if e.meal_type == mt]
-        meals.append(
-            MealGroup(
-                meal_type=mt,
-                entries=[
-                    FoodEntryOut(
-                        id=e.id,
-                        date=e.date,
-                        date_time=e.date_time,
-                        meal_type=e.meal_type,
-                        name=e.name,
-                        calories=e.calories,
-                        protein_g=e.protein_g,
-                        carbs_g=e.carbs_g,
-                        fat_g=e.fat_g,
-                    )
-                    for e in mt_entries
-                ],
+    totals = (
+        await db.execute(
+            select(NutritionDailyTotals).where(
+                NutritionDailyTotals.user_id == user.id,
+                NutritionDailyTotals.date == date,
             )
         )
+    ).scalar_one_or_none()
+
+    order = ["breakfast", "lunch", "dinner", "snacks"]
+    by_meal: dict[str, list[FoodEntryOut]] = {mt: [] for mt in order}
+    for e, out in zip(entries, _food_entries.validate_python(entries, from_attributes=True)):
+        if e.meal_type in by_meal:
+            by_meal[e.meal_type].append(out)
+    meals = [MealGroup(meal_type=mt, entries=by_meal[mt]) for mt in order]
 
     return DayTotals(
         date=date,
-        calories=calories,
-        protein_g=protein,
-        carbs_g=carbs,
-        fat_g=fat,
+        calories=totals.calories if totals else 0,
+        protein_g=totals.protein_g if totals else 0.0,
+        carbs_g=totals.carbs_g if totals else 0.0,
+        fat_g=totals.fat_g if totals else 0.0,
         meals=meals,
     )
 
@@ -102,27 +91,26 @@ from fastapi import HTTPException, status
 
 @router.get("/analytics/last7", response_model=Last7DaysOut)
 async def nutrition_last7(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     end_date = date.today()
     start_date = end_date - timedelta(days=6)
 
     res = await db.execute(
         select(
-            FoodEntry.date.label("d"),
-            func.coalesce(func.sum(FoodEntry.calories), 0).label("calories"),
-            func.coalesce(func.sum(FoodEntry.protein_g), 0.0).label("protein_g"),
-            func.coalesce(func.sum(FoodEntry.carbs_g), 0.0).label("carbs_g"),
-            func.coalesce(func.sum(FoodEntry.fat_g), 0.0).label("fat_g"),
+            NutritionDailyTotals.date.label("d"),
+            NutritionDailyTotals.calories,
+            NutritionDailyTotals.protein_g,
+            NutritionDailyTotals.carbs_g,
+            NutritionDailyTotals.fat_g,
         )
         .where(
-            FoodEntry.user_id == user.id,
-            FoodEntry.date >= start_date,
-            FoodEntry.date <= end_date,
+            NutritionDailyTotals.user_id == user.id,
+            NutritionDailyTotals.date >= start_date,
+            NutritionDailyTotals.date <= end_date,
         )
-        .group_by(FoodEntry.date)
-        .order_by(FoodEntry.date.asc())
+        .order_by(NutritionDailyTotals.date.asc())
     )
 
     rows = res.all()
@@ -146,11 +134,89 @@ async def nutrition_last7(
     return Last7DaysOut(start_date=start_date, end_date=end_date, items=items)
 
 
+def _range_bucket(
+    start: date, days: int, logged_days=0, calories=0, protein_g=0.0, carbs_g=0.0, fat_g=0.0
+) -> RangeBucketOut:
+    totals = {
+        "calories": int(calories),
+        "protein_g": float(protein_g),
+        "carbs_g": float(carbs_g),
+        "fat_g": float(fat_g),
+    }
+    return RangeBucketOut(
+        start=start,
+        days=days,
+        logged_days=logged_days,
+        **totals,
+        **{f"avg_{k}": v / logged_days if logged_days else 0.0 for k, v in totals.items()},
+    )
+
+
+@router.get("/analytics/range", response_model=NutritionRangeOut)
+async def nutrition_range(
+    start: date,
+    end: date,
+    granularity: Literal["day", "week", "month"] = "day",
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Totals and per-logged-day averages for each day, week (Monday start) or
+    month touching [start, end], gaps zero-filled, plus a summary for the
+    whole range. Bucketing runs in SQL over nutrition_daily_totals, so any
+    span costs one range query; the span is capped at
+    NUTRITION_RANGE_MAX_DAYS.
+    """
+    if end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must not be before start")
+    span = (end - start).days + 1
+    if span > settings.NUTRITION_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"range is limited to {settings.NUTRITION_RANGE_MAX_DAYS} days",
+        )
+
+    bucket = BUCKETS[granularity](NutritionDailyTotals.date)
+    sums = (
+        func.count(NutritionDailyTotals.date).label("logged_days"),
+        func.sum(NutritionDailyTotals.calories).label("calories"),
+        func.sum(NutritionDailyTotals.protein_g).label("protein_g"),
+        func.sum(NutritionDailyTotals.carbs_g).label("carbs_g"),
+        func.sum(NutritionDailyTotals.fat_g).label("fat_g"),
+    )
+    res = await db.execute(
+        select(bucket.label("start"), *sums)
+        .where(
+            NutritionDailyTotals.user_id == user.id,
+            NutritionDailyTotals.date >= start,
+            NutritionDailyTotals.date <= end,
+        )
+        .group_by(bucket)
+    )
+    by_bucket = {r.start: r for r in res.all()}
+
+    items = []
+    b = bucket_start(start, granularity)
+    while b <= end:
+        nb = next_bucket(b, granularity)
+        days = (min(nb - timedelta(days=1), end) - max(b, start)).days + 1
+        r = by_bucket.get(b)
+        items.append(_range_bucket(b, days, *(r[1:] if r else ())))
+        b = nb
+
+    summary = _range_bucket(
+        start,
+        span,
+        *(sum(getattr(i, k) for i in items) for k in ("logged_days", "calories", "protein_g", "carbs_g", "fat_g")),
+    )
+    return NutritionRangeOut(start=start, end=end, granularity=granularity, items=items, summary=summary)
+
+
 @router.patch("/entry/{entry_id}", response_model=FoodEntryOut)
 async def update_entry(
     entry_id: int,
     payload: FoodEntryUpdate,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -160,29 +226,22 @@ async def update_entry(
     if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entry not found")
 
+    before = nutrition_totals.entry_totals(entry)
     data = payload.model_dump(exclude_unset=True)
     for k, v in data.items():
         setattr(entry, k, v)
+    after = nutrition_totals.entry_totals(entry)
+    await nutrition_totals.apply_delta(db, user.id, entry.date, {c: after[c] - before[c] for c in after})
 
     await db.commit()
     await db.refresh(entry)
 
-    return FoodEntryOut(
-        id=entry.id,
-        date=entry.date,
-        date_time=entry.date_time,
-        meal_type=entry.meal_type,
-        name=entry.name,
-        calories=entry.calories,
-        protein_g=entry.protein_g,
-        carbs_g=entry.carbs_g,
-        fat_g=entry.fat_g,
-    )
+    return FoodEntryOut.model_validate(entry)
 
 @router.delete("/entry/{entry_id}", status_code=204)
 async def delete_entry(
     entry_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -192,6 +251,7 @@ async def delete_entry(
     if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entry not found")
 
+    await nutrition_totals.remove_entry(db, entry)
     await db.delete(entry)
     await db.commit()
     return
@@ -199,7 +259,7 @@ async def delete_entry(
 @router.delete("/entry/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_food_entry(
     entry_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -210,6 +270,7 @@ async def delete_food_entry(
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
 
+    await nutrition_totals.remove_entry(db, entry)
     await db.delete(entry)
     await db.commit()
     return
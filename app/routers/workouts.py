@@ -1,15 +1,35 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, delete
+import logging
+
+from fastapi import APIRouter, Depends, Header
+from pydantic import TypeAdapter
+from sqlalchemy import select, delete, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func
 
 
+from app.core.analytics_cache import analytics_cache
 from app.core.db import get_db
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_read_db, get_token_user
+from app.core.etags import REVALIDATE, cache_headers, etag_matches, long_lived, make_etag, not_modified
+from app.core.exercise_catalog import (
+    catalog_lookup,
+    normalize_exercise_name,
+    resolve_exercise_id,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.principals import Principal
+from app.core.responses import FastJSONResponse
+from app.core.template_sync import sync_template_exercises
+from app.core.workout_copy import copy_session_into_template, copy_template_into_session
+from app.core import workout_stats
+from app.core.timebuckets import day_range, month_range, utc_now, week_bucket
+from app.models.exercise import Exercise
+from app.models.exercise_session_summary import ExerciseSessionSummary
+from app.models.user_exercise_stats import UserExerciseStats
+from app.models.workout_daily_stats import WorkoutDailyExerciseStats, WorkoutDailyStats
 from app.models.workout_session import WorkoutSession
-from app.models.user import User
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app.schemas.workouts import StartSessionIn
 from app.models.workout_exercise import WorkoutExercise
@@ -22,20 +42,137 @@ from app.schemas.workouts import CreateTemplateIn
 from app.models.workout_template_exercise import WorkoutTemplateExercise
 from app.schemas.workouts import AddTemplateExerciseIn
 
-from app.schemas.workouts import CreateTemplateFromActiveIn
-from app.models.workout_template_set import WorkoutTemplateSet
-
-
+from app.schemas.workouts import CreateTemplateFromActiveIn, UpdateTemplateIn
+from app.schemas.workouts import (
+    ActiveSessionFullOut,
+    ActiveSessionOut,
+    AddExerciseOut,
+    AddSetOut,
+    AddTemplateExerciseOut,
+    CalendarMonthOut,
+    CreateTemplateOut,
+    DeletedOut,
+    ExerciseListOut,
+    ExerciseRefOut,
+    ExerciseTimelineByIdOut,
+    ExerciseTimelineOut,
+    ExerciseVolumeOut,
+    ExerciseWeeklyMaxOut,
+    ExerciseWeeklyVolumeOut,
+    FinishedSessionOut,
+    FinishSessionOut,
+    HistoryItemOut,
+    HistoryOut,
+    PersonalBestOut,
+    PersonalBestsOut,
+    PurgeExerciseOut,
+    PurgeWorkoutsOut,
+    SessionDetailOut,
+    SessionExerciseOut,
+    SessionExerciseTreeOut,
+    SessionOut,
+    SessionSetOut,
+    SessionSummaryOut,
+    SessionTreeOut,
+    SetOut,
+    StartedSessionOut,
+    StartFromTemplateOut,
+    TemplateExerciseOut,
+    TemplateFromActiveOut,
+    TemplateListOut,
+    TemplateOut,
+    TemplateSummaryOut,
+    TimelinePointOut,
+    UpdateSetOut,
+    UpdateTemplateOut,
+    VolumeOut,
+    WeeklyMaxPointOut,
+    WeeklyReviewOut,
+    WeeklyVolumePointOut,
+)
+
+
+
+
+
+router = APIRouter(prefix="/workouts", tags=["workouts"], default_response_class=FastJSONResponse)
+logger = logging.getLogger(__name__)
+
+# Handlers return FastJSONResponse directly; these validate whole result
+# sets from ORM objects or Core rows in one call.
+_session_sets = TypeAdapter(list[SessionSetOut])
+_history_items = TypeAdapter(list[HistoryItemOut])
+_templates = TypeAdapter(list[TemplateOut])
+_exercise_volumes = TypeAdapter(list[ExerciseVolumeOut])
+_personal_bests = TypeAdapter(list[PersonalBestOut])
+_timeline_points = TypeAdapter(list[TimelinePointOut])
+_weekly_max_points = TypeAdapter(list[WeeklyMaxPointOut])
+_weekly_volume_points = TypeAdapter(list[WeeklyVolumePointOut])
+
+
+def _exercise_session_id(exercise_id: int):
+    return select(WorkoutExercise.session_id).where(WorkoutExercise.id == exercise_id).scalar_subquery()
+
+
+def _session_etag(session: WorkoutSession) -> str:
+    return make_etag("session", session.id, session.version, session.updated_at)
+
+
+async def _touch_sessions(db: AsyncSession, *where) -> None:
+    """Bumps version (and updated_at) on sessions whose exercises or sets changed."""
+    await db.execute(
+        update(WorkoutSession)
+        .where(*where)
+        .values(version=WorkoutSession.version + 1)
+        .execution_options(synchronize_session=False)
+    )
 
 
+async def _session_tree(db: AsyncSession, session: WorkoutSession) -> SessionTreeOut:
+    ex_res = await db.execute(
+        select(WorkoutExercise.id, WorkoutExercise.name, WorkoutExercise.order_index)
+        .where(WorkoutExercise.session_id == session.id)
+        .order_by(WorkoutExercise.order_index.asc(), WorkoutExercise.id.asc())
+    )
+    exercises = ex_res.all()
 
-router = APIRouter(prefix="/workouts", tags=["workouts"])
+    sets_by_ex: dict[int, list[SessionSetOut]] = {e.id: [] for e in exercises}
+    if exercises:
+        set_res = await db.execute(
+            select(
+                WorkoutSet.id,
+                WorkoutSet.exercise_id,
+                WorkoutSet.set_number,
+                WorkoutSet.reps,
+                WorkoutSet.weight_kg,
+                WorkoutSet.created_at,
+            )
+            .where(WorkoutSet.exercise_id.in_(sets_by_ex))
+            .order_by(WorkoutSet.exercise_id.asc(), WorkoutSet.set_number.asc(), WorkoutSet.id.asc())
+        )
+        rows = set_res.all()
+        for row, out in zip(rows, _session_sets.validate_python(rows, from_attributes=True)):
+            sets_by_ex[row.exercise_id].append(out)
+        logger.debug("session %d: %d exercises, %d sets", session.id, len(exercises), len(rows))
+
+    return SessionTreeOut(
+        id=session.id,
+        status=session.status,
+        started_at=session.started_at,
+        ended_at=session.ended_at,
+        title=session.title,
+        notes=session.notes,
+        exercises=[
+            SessionExerciseTreeOut(id=e.id, name=e.name, order_index=e.order_index, sets=sets_by_ex[e.id])
+            for e in exercises
+        ],
+    )
 
 
-@router.post("/session/start")
+@router.post("/session/start", response_model=SessionOut)
 async def start_session(
     payload: StartSessionIn,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
 
@@ -48,14 +185,7 @@ async def start_session(
     )
     existing = res.scalar_one_or_none()
     if existing:
-        return {
-            "id": existing.id,
-            "status": existing.status,
-            "started_at": existing.started_at,
-            "ended_at": existing.ended_at,
-            "title": existing.title,
-            "notes": existing.notes,
-        }
+        return FastJSONResponse(SessionOut.model_validate(existing))
 
     # Otherwise create a new active session
     session = WorkoutSession(
@@ -68,18 +198,11 @@ async def start_session(
     await db.commit()
     await db.refresh(session)
 
-    return {
-        "id": session.id,
-        "status": session.status,
-        "started_at": session.started_at,
-        "ended_at": session.ended_at,
-        "title": session.title,
-        "notes": session.notes,
-    }
+    return FastJSONResponse(SessionOut.model_validate(session))
 
-@router.get("/session/active")
+@router.get("/session/active", response_model=ActiveSessionOut)
 async def get_active_session(
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -91,24 +214,14 @@ async def get_active_session(
     session = res.scalar_one_or_none()
 
     if not session:
-        return {"active": False, "session": None}
-
-    return {
-        "active": True,
-        "session": {
-            "id": session.id,
-            "status": session.status,
-            "started_at": session.started_at,
-            "ended_at": session.ended_at,
-            "title": session.title,
-            "notes": session.notes,
-        },
-    }
-
-
-@router.post("/session/finish")
+        return FastJSONResponse(ActiveSessionOut(active=False, session=None))
+
+    return FastJSONResponse(ActiveSessionOut(active=True, session=SessionOut.model_validate(session)))
+
+
+@router.post("/session/finish", response_model=FinishSessionOut)
 async def finish_session(
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -120,12 +233,31 @@ async def finish_session(
     session = res.scalar_one_or_none()
 
     if not session:
-        return {"finished": False, "detail": "No active session"}
+        return FastJSONResponse(FinishSessionOut(finished=False, detail="No active session"))
 
     session.status = "finished"
     session.ended_at = datetime.now(timezone.utc)
+    session.version = WorkoutSession.version + 1
+
+    # Stamp the denormalized copies in the same transaction
+    await db.execute(
+        update(WorkoutExercise)
+        .where(WorkoutExercise.session_id == session.id)
+        .values(performed_at=session.ended_at)
+    )
+    await db.execute(
+        update(WorkoutSet)
+        .where(
+            WorkoutSet.exercise_id.in_(
+                select(WorkoutExercise.id).where(WorkoutExercise.session_id == session.id)
+            )
+        )
+        .values(performed_at=session.ended_at)
+    )
+    await workout_stats.add_finished_session(db, session)
 
     await db.commit()
+    await analytics_cache.invalidate_user(user.id)
     await db.refresh(session)
 
     # Build summary for the finished session
@@ -149,28 +281,24 @@ async def finish_session(
     if session.started_at and session.ended_at:
         duration_seconds = int((session.ended_at - session.started_at).total_seconds())
 
-    return {
-        "finished": True,
-        "session": {
-            "id": session.id,
-            "source_template_id": session.source_template_id,  # NEW LINE - Return template ID
-            "status": session.status,
-            "started_at": session.started_at,
-            "ended_at": session.ended_at,
-        },
-        "summary": {
-            "exercises_count": exercises_count,
-            "total_sets": total_sets,
-            "total_volume": total_volume,
-            "duration_seconds": duration_seconds,
-        },
-    }
-
-
-@router.post("/session/exercise")
+    return FastJSONResponse(
+        FinishSessionOut(
+            finished=True,
+            session=FinishedSessionOut.model_validate(session),
+            summary=SessionSummaryOut(
+                exercises_count=exercises_count,
+                total_sets=total_sets,
+                total_volume=total_volume,
+                duration_seconds=duration_seconds,
+            ),
+        )
+    )
+
+
+@router.post("/session/exercise", response_model=AddExerciseOut)
 async def add_exercise_to_active_session(
     payload: AddExerciseIn,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Find active session
@@ -182,32 +310,27 @@ async def add_exercise_to_active_session(
     )
     session = res.scalar_one_or_none()
     if not session:
-        return {"created": False, "detail": "No active session"}
+        return FastJSONResponse(AddExerciseOut(created=False, detail="No active session"))
 
     ex = WorkoutExercise(
         session_id=session.id,
+        user_id=user.id,
+        exercise_id=await resolve_exercise_id(db, user.id, payload.name),
         name=payload.name,
         order_index=payload.order_index or 0,
     )
     db.add(ex)
+    await _touch_sessions(db, WorkoutSession.id == session.id)
     await db.commit()
     await db.refresh(ex)
 
-    return {
-        "created": True,
-        "exercise": {
-            "id": ex.id,
-            "session_id": ex.session_id,
-            "name": ex.name,
-            "order_index": ex.order_index,
-        },
-    }
-
-@router.post("/session/exercise/{exercise_id}/set")
+    return FastJSONResponse(AddExerciseOut(created=True, exercise=SessionExerciseOut.model_validate(ex)))
+
+@router.post("/session/exercise/{exercise_id}/set", response_model=AddSetOut)
 async def add_set_to_exercise(
     exercise_id: int,
     payload: AddSetIn,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Verify exercise belongs to user's active session
@@ -222,41 +345,31 @@ async def add_set_to_exercise(
     )
     exercise = res.scalar_one_or_none()
     if not exercise:
-        return {"created": False, "detail": "Exercise not found or no active session"}
+        return FastJSONResponse(AddSetOut(created=False, detail="Exercise not found or no active session"))
 
     s = WorkoutSet(
         exercise_id=exercise.id,
+        user_id=user.id,
         set_number=payload.set_number,
         reps=payload.reps,
         weight_kg=payload.weight_kg,
     )
     db.add(s)
+    await _touch_sessions(db, WorkoutSession.id == exercise.session_id)
     await db.commit()
     await db.refresh(s)
 
-    return {
-        "created": True,
-        "set": {
-            "id": s.id,
-            "exercise_id": s.exercise_id,
-            "set_number": s.set_number,
-            "reps": s.reps,
-            "weight_kg": s.weight_kg,
-        },
-    }
+    return FastJSONResponse(AddSetOut(created=True, set=SetOut.model_validate(s)))
 
 
-@router.patch("/session/exercise/{exercise_id}/set/{set_id}")
+@router.patch("/session/exercise/{exercise_id}/set/{set_id}", response_model=UpdateSetOut)
 async def update_set(
     exercise_id: int,
     set_id: int,
     payload: UpdateSetIn,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    print(f"=== UPDATE SET - exercise_id={exercise_id}, set_id={set_id} ===")
-    print(f"Payload: {payload.model_dump()}")
-    
     res = await db.execute(
         select(WorkoutSet)
         .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
@@ -271,42 +384,35 @@ async def update_set(
     s_obj = res.scalar_one_or_none()
     
     if not s_obj:
-        print("ERROR: Set not found!")
-        return {"updated": False, "detail": "Set not found or no active session"}
-
-    print(f"Found set: id={s_obj.id}, set_number={s_obj.set_number}, old_reps={s_obj.reps}, old_weight={s_obj.weight_kg}")
+        logger.info("update set: set %d not found for exercise %d", set_id, exercise_id)
+        return FastJSONResponse(UpdateSetOut(updated=False, detail="Set not found or no active session"))
 
     data = payload.model_dump(exclude_unset=True)
+    logger.debug(
+        "update set %d: reps %s -> %s, weight %s -> %s",
+        s_obj.id,
+        s_obj.reps,
+        data.get("reps", s_obj.reps),
+        s_obj.weight_kg,
+        data.get("weight_kg", s_obj.weight_kg),
+    )
     if "reps" in data:
         s_obj.reps = data["reps"]
-        print(f"Updated reps to: {s_obj.reps}")
     if "weight_kg" in data:
         s_obj.weight_kg = data["weight_kg"]
-        print(f"Updated weight to: {s_obj.weight_kg}")
+    await _touch_sessions(db, WorkoutSession.id == _exercise_session_id(exercise_id))
 
     await db.commit()
     await db.refresh(s_obj)
-    
-    print(f"After commit: id={s_obj.id}, reps={s_obj.reps}, weight={s_obj.weight_kg}")
-    print("=== UPDATE SET COMPLETE ===")
-
-    return {
-        "updated": True,
-        "set": {
-            "id": s_obj.id,
-            "exercise_id": s_obj.exercise_id,
-            "set_number": s_obj.set_number,
-            "reps": s_obj.reps,
-            "weight_kg": s_obj.weight_kg,
-        },
-    }
-
-
-@router.delete("/session/exercise/{exercise_id}/set/{set_id}")
+
+    return FastJSONResponse(UpdateSetOut(updated=True, set=SetOut.model_validate(s_obj)))
+
+
+@router.delete("/session/exercise/{exercise_id}/set/{set_id}", response_model=DeletedOut)
 async def delete_set(
     exercise_id: int,
     set_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -322,16 +428,18 @@ async def delete_set(
     )
     s_obj = res.scalar_one_or_none()
     if not s_obj:
-        return {"deleted": False, "detail": "Set not found or no active session"}
+        return FastJSONResponse(DeletedOut(deleted=False, detail="Set not found or no active session"))
 
     await db.delete(s_obj)
+    await _touch_sessions(db, WorkoutSession.id == _exercise_session_id(exercise_id))
     await db.commit()
 
-    return {"deleted": True, "set_id": set_id}
+    return FastJSONResponse(DeletedOut(deleted=True, set_id=set_id))
 
-@router.get("/session/active/full")
+@router.get("/session/active/full", response_model=ActiveSessionFullOut)
 async def get_active_session_full(
-    user: User = Depends(get_current_user),
+    if_none_match: str | None = Header(default=None),
+    user: Principal = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Active session
@@ -342,91 +450,53 @@ async def get_active_session_full(
         )
     )
     session = res.scalar_one_or_none()
+    etag = _session_etag(session) if session else make_etag("no-active-session", user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, REVALIDATE)
+
+    headers = cache_headers(etag, REVALIDATE)
     if not session:
-        return {"active": False, "session": None}
+        return FastJSONResponse(ActiveSessionFullOut(active=False, session=None), headers=headers)
 
-    # Exercises in session
-    ex_res = await db.execute(
-        select(WorkoutExercise)
-        .where(WorkoutExercise.session_id == session.id)
-        .order_by(WorkoutExercise.order_index.asc(), WorkoutExercise.id.asc())
+    return FastJSONResponse(
+        ActiveSessionFullOut(active=True, session=await _session_tree(db, session)), headers=headers
     )
-    exercises = ex_res.scalars().all()
 
-    exercise_ids = [e.id for e in exercises]
-    sets_by_ex: dict[int, list[WorkoutSet]] = {eid: [] for eid in exercise_ids}
 
-    if exercise_ids:
-        set_res = await db.execute(
-            select(WorkoutSet)
-            .where(WorkoutSet.exercise_id.in_(exercise_ids))
-            .order_by(WorkoutSet.exercise_id.asc(), WorkoutSet.set_number.asc(), WorkoutSet.id.asc())
-        )
-        sets = set_res.scalars().all()
-        for s in sets:
-            sets_by_ex[s.exercise_id].append(s)
-
-    return {
-        "active": True,
-        "session": {
-            "id": session.id,
-            "status": session.status,
-            "started_at": session.started_at,
-            "ended_at": session.ended_at,
-            "title": session.title,
-            "notes": session.notes,
-            "exercises": [
-                {
-                    "id": e.id,
-                    "name": e.name,
-                    "order_index": e.order_index,
-                    "sets": [
-                        {
-                            "id": s.id,
-                            "set_number": s.set_number,
-                            "reps": s.reps,
-                            "weight_kg": s.weight_kg,
-                            "created_at": s.created_at,
-                        }
-                        for s in sets_by_ex.get(e.id, [])
-                    ],
-                }
-                for e in exercises
-            ],
-        },
-    }
-
-
-@router.get("/templates")
+@router.get("/templates", response_model=TemplateListOut)
 async def list_templates(
-    user: User = Depends(get_current_user),
+    if_none_match: str | None = Header(default=None),
+    user: Principal = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
-        select(WorkoutTemplate)
+        select(
+            WorkoutTemplate.id,
+            WorkoutTemplate.name,
+            WorkoutTemplate.description,
+            WorkoutTemplate.created_at,
+            WorkoutTemplate.version,
+        )
         .where(WorkoutTemplate.user_id == user.id)
         .order_by(WorkoutTemplate.created_at.desc())
     )
-    templates = res.scalars().all()
+    templates = res.all()
 
-    return {
-        "items": [
-            {
-                "id": t.id,
-                "name": t.name,
-                "description": t.description,
-                "created_at": t.created_at,
-            }
-            for t in templates
-        ]
-    }
+    etag = make_etag("templates", user.id, [(t.id, t.version, t.created_at) for t in templates])
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, REVALIDATE)
+
+    return FastJSONResponse(
+        TemplateListOut(items=_templates.validate_python(templates, from_attributes=True)),
+        headers=cache_headers(etag, REVALIDATE),
+    )
 
 
 
-@router.post("/templates")
+@router.post("/templates", response_model=CreateTemplateOut)
 async def create_template(
     payload: CreateTemplateIn,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     t = WorkoutTemplate(
@@ -438,27 +508,16 @@ async def create_template(
     await db.commit()
     await db.refresh(t)
 
-    return {
-        "created": True,
-        "template": {
-            "id": t.id,
-            "name": t.name,
-            "description": t.description,
-            "created_at": t.created_at,
-        },
-    }
+    return FastJSONResponse(CreateTemplateOut(created=True, template=TemplateOut.model_validate(t)))
 
 
-@router.patch("/templates/{template_id}")
+@router.patch("/templates/{template_id}", response_model=UpdateTemplateOut)
 async def update_template(
     template_id: int,
-    payload: dict,
-    user: User = Depends(get_current_user),
+    payload: UpdateTemplateIn,
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    print(f"=== UPDATE TEMPLATE - Template ID: {template_id} ===")
-    print(f"Payload has exercises: {'exercises' in payload}")
-    
     # Get the template
     res = await db.execute(
         select(WorkoutTemplate).where(
@@ -469,89 +528,41 @@ async def update_template(
     template = res.scalar_one_or_none()
     
     if not template:
-        return {"updated": False, "detail": "Template not found"}
+        return FastJSONResponse(UpdateTemplateOut(updated=False, detail="Template not found"))
     
     # Update name and description if provided
-    if "name" in payload:
-        template.name = payload["name"]
-    if "description" in payload:
-        template.description = payload["description"]
+    if payload.name is not None:
+        template.name = payload.name
+    if "description" in payload.model_fields_set:
+        template.description = payload.description
+    changed = db.is_modified(template)
     
-    # Update exercises if provided
-    if "exercises" in payload:
-        # First, manually delete all sets for this template
-        print("Deleting existing template sets...")
-        sets_to_delete = await db.execute(
-            select(WorkoutTemplateSet)
-            .join(WorkoutTemplateExercise)
-            .where(WorkoutTemplateExercise.template_id == template_id)
+    # Reconcile exercises and sets if provided; only changed rows are written
+    if payload.exercises is not None:
+        counts = await sync_template_exercises(db, template.id, user.id, payload.exercises)
+        logger.debug(
+            "template %d rows: %d inserted, %d updated, %d deleted",
+            template.id,
+            counts.inserted,
+            counts.updated,
+            counts.deleted,
         )
-        all_sets = sets_to_delete.scalars().all()
-        print(f"Found {len(all_sets)} sets to delete")
-        for s in all_sets:
-            print(f"  Deleting set: id={s.id}, set_number={s.set_number}, reps={s.reps}")
-            await db.delete(s)
-        await db.flush()
-        
-        # Delete existing exercises
-        print("Deleting existing template exercises...")
-        ex_res = await db.execute(
-            select(WorkoutTemplateExercise).where(
-                WorkoutTemplateExercise.template_id == template_id
-            )
-        )
-        existing_exercises = ex_res.scalars().all()
-        print(f"Found {len(existing_exercises)} exercises to delete")
-        for ex in existing_exercises:
-            print(f"  Deleting exercise: id={ex.id}, name={ex.name}")
-            await db.delete(ex)
-        await db.flush()
-        
-        # Add new exercises
-        print(f"Adding {len(payload['exercises'])} new exercises...")
-        for ex_data in payload["exercises"]:
-            print(f"  Creating exercise: {ex_data['name']}")
-            new_ex = WorkoutTemplateExercise(
-                template_id=template_id,
-                name=ex_data["name"],
-                order_index=ex_data["order_index"],
-            )
-            db.add(new_ex)
-            await db.flush()
-            print(f"    Exercise created: ID={new_ex.id}")
-            
-            # Add sets for this exercise
-            sets_data = ex_data.get("sets", [])
-            print(f"    Adding {len(sets_data)} sets...")
-            for set_data in sets_data:
-                print(f"      Creating set: set_number={set_data['set_number']}, reps={set_data.get('target_reps')}, weight={set_data.get('target_weight_kg')}")
-                new_set = WorkoutTemplateSet(
-                    template_exercise_id=new_ex.id,
-                    set_number=set_data["set_number"],
-                    reps=set_data.get("target_reps"),
-                    weight_kg=set_data.get("target_weight_kg"),
-                )
-                db.add(new_set)
+        changed = changed or bool(counts.inserted or counts.updated or counts.deleted)
+
+    # A no-op update keeps the version, so cached copies stay valid
+    if changed:
+        template.version = WorkoutTemplate.version + 1
     
     await db.commit()
     await db.refresh(template)
-    
-    print("=== UPDATE TEMPLATE COMPLETE ===")
-    
-    return {
-        "updated": True,
-        "template": {
-            "id": template.id,
-            "name": template.name,
-            "description": template.description,
-        },
-    }
+
+    return FastJSONResponse(UpdateTemplateOut(updated=True, template=TemplateSummaryOut.model_validate(template)))
 
 
-@router.delete("/templates/{template_id}")
+@router.delete("/templates/{template_id}", response_model=DeletedOut)
 async def delete_template(
     template_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     res = await db.execute(
@@ -563,20 +574,20 @@ async def delete_template(
     tpl = res.scalar_one_or_none()
 
     if not tpl:
-        return {"deleted": False, "detail": "Template not found"}
+        return FastJSONResponse(DeletedOut(deleted=False, detail="Template not found"))
 
     await db.delete(tpl)
     await db.commit()
 
-    return {"deleted": True, "template_id": template_id}
+    return FastJSONResponse(DeletedOut(deleted=True, template_id=template_id))
 
 
 
-@router.post("/templates/{template_id}/exercises")
+@router.post("/templates/{template_id}/exercises", response_model=AddTemplateExerciseOut)
 async def add_exercise_to_template(
     template_id: int,
     payload: AddTemplateExerciseIn,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Ensure template belongs to user
@@ -588,10 +599,12 @@ async def add_exercise_to_template(
     )
     template = res.scalar_one_or_none()
     if not template:
-        return {"created": False, "detail": "Template not found"}
+        return FastJSONResponse(AddTemplateExerciseOut(created=False, detail="Template not found"))
 
+    template.version = WorkoutTemplate.version + 1
     ex = WorkoutTemplateExercise(
         template_id=template.id,
+        exercise_id=await resolve_exercise_id(db, user.id, payload.name),
         name=payload.name,
         order_index=payload.order_index or 0,
     )
@@ -599,25 +612,15 @@ async def add_exercise_to_template(
     await db.commit()
     await db.refresh(ex)
 
-    return {
-        "created": True,
-        "exercise": {
-            "id": ex.id,
-            "template_id": ex.template_id,
-            "name": ex.name,
-            "order_index": ex.order_index,
-        },
-    }
+    return FastJSONResponse(AddTemplateExerciseOut(created=True, exercise=TemplateExerciseOut.model_validate(ex)))
 
 
-@router.post("/templates/{template_id}/start")
+@router.post("/templates/{template_id}/start", response_model=StartFromTemplateOut)
 async def start_session_from_template(
     template_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    print(f"=== START FROM TEMPLATE - Template ID: {template_id} ===")
-    
     # Get template
     res = await db.execute(
         select(WorkoutTemplate).where(
@@ -627,7 +630,7 @@ async def start_session_from_template(
     )
     template = res.scalar_one_or_none()
     if not template:
-        return {"started": False, "detail": "Template not found"}
+        return FastJSONResponse(StartFromTemplateOut(started=False, detail="Template not found"))
 
     # Prevent multiple active sessions
     res = await db.execute(
@@ -637,9 +640,9 @@ async def start_session_from_template(
         )
     )
     if res.scalar_one_or_none():
-        return {"started": False, "detail": "Active session already exists"}
+        return FastJSONResponse(StartFromTemplateOut(started=False, detail="Active session already exists"))
 
-    # Create new session with source_template_id
+    # Create new session with source_template_id, then copy the template tree into it
     session = WorkoutSession(
         user_id=user.id,
         status="active",
@@ -648,73 +651,18 @@ async def start_session_from_template(
         source_template_id=template_id,
     )
     db.add(session)
+    await db.flush()
+    await copy_template_into_session(db, template.id, session.id, user.id)
     await db.commit()
-    await db.refresh(session)
-    print(f"Session created: ID={session.id}")
-
-    # Get template exercises
-    ex_res = await db.execute(
-        select(WorkoutTemplateExercise)
-        .where(WorkoutTemplateExercise.template_id == template.id)
-        .order_by(
-            WorkoutTemplateExercise.order_index.asc(),
-            WorkoutTemplateExercise.id.asc(),
-        )
-    )
-    template_exercises = ex_res.scalars().all()
-    print(f"Found {len(template_exercises)} template exercises")
-
-    for tex in template_exercises:
-        print(f"Processing template exercise: {tex.name} (ID={tex.id})")
-        
-        ex = WorkoutExercise(
-            session_id=session.id,
-            name=tex.name,
-            order_index=tex.order_index,
-            source_template_exercise_id=tex.id,
-        )
-        db.add(ex)
-        await db.commit()
-        await db.refresh(ex)
-        print(f"  Workout exercise created: ID={ex.id}")
-
-        # Copy template sets into real sets
-        ts_res = await db.execute(
-            select(WorkoutTemplateSet)
-            .where(WorkoutTemplateSet.template_exercise_id == tex.id)
-            .order_by(WorkoutTemplateSet.set_number.asc())
-        )
-        tsets = ts_res.scalars().all()
-        print(f"  Found {len(tsets)} template sets")
-
-        for ts in tsets:
-            print(f"    Creating workout set: set_number={ts.set_number}, reps={ts.reps}, weight={ts.weight_kg}")
-            s = WorkoutSet(
-                exercise_id=ex.id,
-                set_number=ts.set_number,
-                reps=ts.reps,
-                weight_kg=ts.weight_kg,
-                source_template_set_id=ts.id,
-            )
-            db.add(s)
-
-    await db.commit()
-    print("=== START FROM TEMPLATE COMPLETE ===")
+    logger.info("started session %d from template %d", session.id, template.id)
 
-    return {
-        "started": True,
-        "session": {
-            "id": session.id,
-            "title": session.title,
-            "notes": session.notes,
-        },
-    }
+    return FastJSONResponse(StartFromTemplateOut(started=True, session=StartedSessionOut.model_validate(session)))
 
 
-@router.get("/analytics/weekly-review")
+@router.get("/analytics/weekly-review", response_model=WeeklyReviewOut)
 async def analytics_weekly_review(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Weekly review summary for the last 7 days:
@@ -725,506 +673,425 @@ async def analytics_weekly_review(
     - top_exercises_by_volume (top 5)
     - prs_count (new max-weight PRs in last 7 days)
     """
-    # Sessions finished in last 7 days
-    sess_res = await db.execute(
-        select(func.count(WorkoutSession.id))
-        .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSession.ended_at.isnot(None),
-            WorkoutSession.ended_at >= func.datetime("now", "-7 days"),
-        )
-    )
-    sessions_count = int(sess_res.scalar() or 0)
+    key, cached = await analytics_cache.lookup(user.id, "weekly-review")
+    if cached is not None:
+        return cached
+
+    # Last 7 UTC calendar days, today included, read from the daily rollups
+    since_day = utc_now().date() - timedelta(days=6)
+    since = day_range(since_day)[0]
 
-    # Totals across sets in last 7 days (finished sessions only)
     totals_res = await db.execute(
         select(
-            func.count(WorkoutSet.id).label("sets"),
-            func.coalesce(func.sum(WorkoutSet.reps), 0).label("reps"),
-            func.coalesce(func.sum(WorkoutSet.weight_kg * WorkoutSet.reps), 0).label("volume"),
-        )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
-        .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSession.ended_at.isnot(None),
-            WorkoutSession.ended_at >= func.datetime("now", "-7 days"),
+            func.coalesce(func.sum(WorkoutDailyStats.sessions), 0).label("sessions"),
+            func.coalesce(func.sum(WorkoutDailyStats.sets), 0).label("sets"),
+            func.coalesce(func.sum(WorkoutDailyStats.reps), 0).label("reps"),
+            func.coalesce(func.sum(WorkoutDailyStats.volume), 0).label("volume"),
+        ).where(
+            WorkoutDailyStats.user_id == user.id,
+            WorkoutDailyStats.day >= since_day,
         )
     )
     tr = totals_res.first()
-    total_sets = int(tr.sets or 0)
-    total_reps = int(tr.reps or 0)
-    total_volume = float(tr.volume or 0)
+    sessions_count = int(tr.sessions)
+    total_sets = int(tr.sets)
+    total_reps = int(tr.reps)
+    total_volume = float(tr.volume)
 
     # Top 5 exercises by volume in last 7 days
     top_res = await db.execute(
         select(
-            WorkoutExercise.name.label("exercise"),
-            func.coalesce(func.sum(WorkoutSet.weight_kg * WorkoutSet.reps), 0).label("volume"),
-            func.count(WorkoutSet.id).label("sets"),
+            Exercise.name.label("exercise"),
+            func.sum(WorkoutDailyExerciseStats.volume).label("volume"),
+            func.sum(WorkoutDailyExerciseStats.sets).label("sets"),
         )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
+        .join(Exercise, WorkoutDailyExerciseStats.exercise_id == Exercise.id)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSession.ended_at.isnot(None),
-            WorkoutSession.ended_at >= func.datetime("now", "-7 days"),
+            WorkoutDailyExerciseStats.user_id == user.id,
+            WorkoutDailyExerciseStats.day >= since_day,
         )
-        .group_by(WorkoutExercise.name)
-        .order_by(func.sum(WorkoutSet.weight_kg * WorkoutSet.reps).desc())
+        .group_by(Exercise.id, Exercise.name)
+        .order_by(func.sum(WorkoutDailyExerciseStats.volume).desc())
         .limit(5)
     )
     top_rows = top_res.all()
 
-    # PRs count in last 7 days:
-    # For each exercise name, determine all-time max weight; count exercises whose max occurred in last 7 days.
-    subq = (
-        select(
-            WorkoutExercise.name.label("exercise"),
-            func.max(WorkoutSet.weight_kg).label("max_weight"),
-        )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
-        .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSet.weight_kg.isnot(None),
-            WorkoutSession.ended_at.isnot(None),
-        )
-        .group_by(WorkoutExercise.name)
-        .subquery()
-    )
-
+    # Exercises whose all-time best weight was (last) lifted in the window
     prs_res = await db.execute(
-        select(func.count(func.distinct(subq.c.exercise)))
-        .select_from(subq)
-        .join(WorkoutExercise, WorkoutExercise.name == subq.c.exercise)
-        .join(WorkoutSet, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutSession.id == WorkoutExercise.session_id)
-        .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSet.weight_kg == subq.c.max_weight,
-            WorkoutSession.ended_at.isnot(None),
-            WorkoutSession.ended_at >= func.datetime("now", "-7 days"),
+        select(func.count()).where(
+            UserExerciseStats.user_id == user.id,
+            UserExerciseStats.best_weight_at >= since,
         )
     )
     prs_count = int(prs_res.scalar() or 0)
 
-    return {
-        "range": "last_7_days",
-        "sessions_count": sessions_count,
-        "total_sets": total_sets,
-        "total_reps": total_reps,
-        "total_volume": total_volume,
-        "prs_count": prs_count,
-        "top_exercises_by_volume": [
-            {"exercise": r.exercise, "volume": float(r.volume or 0), "sets": int(r.sets or 0)}
-            for r in top_rows
-        ],
-    }
+    response = FastJSONResponse(
+        WeeklyReviewOut(
+            range="last_7_days",
+            sessions_count=sessions_count,
+            total_sets=total_sets,
+            total_reps=total_reps,
+            total_volume=total_volume,
+            prs_count=prs_count,
+            top_exercises_by_volume=_exercise_volumes.validate_python(top_rows, from_attributes=True),
+        )
+    )
+    return await analytics_cache.store(key, response)
 
 
 
-@router.get("/analytics/volume")
+@router.get("/analytics/volume", response_model=VolumeOut)
 async def analytics_volume_last_7_days(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    # last 7 days (SQLite-compatible)
-    # Only finished sessions to avoid counting in-progress workouts
+    key, cached = await analytics_cache.lookup(user.id, "volume")
+    if cached is not None:
+        return cached
+
+    # Rollups only cover finished sessions; same 7-day window as the weekly review
+    since_day = utc_now().date() - timedelta(days=6)
     res = await db.execute(
         select(
-            WorkoutExercise.name.label("exercise"),
-            func.sum(func.coalesce(WorkoutSet.weight_kg, 0) * func.coalesce(WorkoutSet.reps, 0)).label("volume"),
-            func.count(WorkoutSet.id).label("sets"),
+            Exercise.name.label("exercise"),
+            func.sum(WorkoutDailyExerciseStats.volume).label("volume"),
+            func.sum(WorkoutDailyExerciseStats.sets).label("sets"),
         )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
+        .join(Exercise, WorkoutDailyExerciseStats.exercise_id == Exercise.id)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSession.ended_at.isnot(None),
-            WorkoutSession.ended_at >= func.datetime("now", "-7 days"),
+            WorkoutDailyExerciseStats.user_id == user.id,
+            WorkoutDailyExerciseStats.day >= since_day,
         )
-        .group_by(WorkoutExercise.name)
-        .order_by(func.sum((WorkoutSet.weight_kg * WorkoutSet.reps)).desc())
+        .group_by(Exercise.id, Exercise.name)
+        .order_by(func.sum(WorkoutDailyExerciseStats.volume).desc())
     )
 
     rows = res.all()
-    return {
-        "range": "last_7_days",
-        "items": [
-            {
-                "exercise": r.exercise,
-                "volume": float(r.volume or 0),
-                "sets": int(r.sets or 0),
-            }
-            for r in rows
-        ],
-    }
+    response = FastJSONResponse(
+        VolumeOut(range="last_7_days", items=_exercise_volumes.validate_python(rows, from_attributes=True))
+    )
+    return await analytics_cache.store(key, response)
 
 
-@router.get("/analytics/prs")
+@router.get("/analytics/prs", response_model=PersonalBestsOut)
 async def analytics_personal_bests(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    # Get max weight per exercise name
-    subq = (
-        select(
-            WorkoutExercise.name.label("exercise"),
-            func.max(WorkoutSet.weight_kg).label("max_weight"),
-        )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
-        .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSet.weight_kg.isnot(None),
-            WorkoutSession.ended_at.isnot(None),
-        )
-        .group_by(WorkoutExercise.name)
-        .subquery()
-    )
+    key, cached = await analytics_cache.lookup(user.id, "prs")
+    if cached is not None:
+        return cached
 
-    # Join back to find one matching set (weight == max_weight)
     res = await db.execute(
         select(
-            subq.c.exercise,
-            subq.c.max_weight,
-            WorkoutSet.reps,
-            WorkoutSession.ended_at,
+            Exercise.name.label("exercise"),
+            UserExerciseStats.best_weight_kg.label("weight_kg"),
+            UserExerciseStats.best_weight_reps.label("reps"),
+            UserExerciseStats.best_weight_at.label("date"),
+            UserExerciseStats.best_e1rm_kg,
         )
-        .select_from(subq)
-        .join(WorkoutExercise, WorkoutExercise.name == subq.c.exercise)
-        .join(WorkoutSet, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutSession.id == WorkoutExercise.session_id)
+        .join(Exercise, UserExerciseStats.exercise_id == Exercise.id)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSet.weight_kg == subq.c.max_weight,
+            UserExerciseStats.user_id == user.id,
+            UserExerciseStats.best_weight_kg.isnot(None),
         )
-        .order_by(subq.c.exercise.asc(), WorkoutSession.ended_at.desc())
+        .order_by(Exercise.name.asc())
     )
 
-    rows = res.all()
-
-    # Keep only the newest match per exercise (in case multiple sets hit the same max)
-    best: dict[str, dict] = {}
-    for r in rows:
-        if r.exercise not in best:
-            best[r.exercise] = {
-                "exercise": r.exercise,
-                "weight_kg": float(r.max_weight or 0),
-                "reps": r.reps,
-                "date": r.ended_at,
-            }
-
-    return {"items": list(best.values())}
+    response = FastJSONResponse(PersonalBestsOut(items=_personal_bests.validate_python(res.all(), from_attributes=True)))
+    return await analytics_cache.store(key, response)
 
 
-@router.get("/analytics/exercise/{exercise_name}/timeline")
+@router.get("/analytics/exercise/{exercise_name}/timeline", response_model=ExerciseTimelineOut)
 async def analytics_exercise_timeline(
     exercise_name: str,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Timeline of max weight used per finished session for a given exercise.
     """
+    key, cached = await analytics_cache.lookup(user.id, "timeline", exercise_name)
+    if cached is not None:
+        return cached
+
+    catalog = catalog_lookup(user.id, [normalize_exercise_name(exercise_name)]).subquery()
 
     res = await db.execute(
         select(
-            WorkoutSession.ended_at.label("date"),
-            func.max(WorkoutSet.weight_kg).label("max_weight"),
+            ExerciseSessionSummary.ended_at.label("date"),
+            func.max(ExerciseSessionSummary.top_weight_kg).label("weight_kg"),
         )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutExercise.name == exercise_name,
-            WorkoutSet.weight_kg.isnot(None),
-            WorkoutSession.ended_at.isnot(None),
+            ExerciseSessionSummary.user_id == user.id,
+            ExerciseSessionSummary.exercise_id.in_(select(catalog.c.exercise_id)),
+            ExerciseSessionSummary.top_weight_kg.isnot(None),
         )
-        .group_by(WorkoutSession.id)
-        .order_by(WorkoutSession.ended_at.asc())
+        # An alias can point at a second catalog entry; keep one point per session
+        .group_by(ExerciseSessionSummary.session_id, ExerciseSessionSummary.ended_at)
+        .order_by(ExerciseSessionSummary.ended_at.asc())
     )
 
     rows = res.all()
 
-    return {
-        "exercise": exercise_name,
-        "points": [
-            {
-                "date": r.date,
-                "weight_kg": float(r.max_weight),
-            }
-            for r in rows
-        ],
-    }
+    response = FastJSONResponse(
+        ExerciseTimelineOut(exercise=exercise_name, points=_timeline_points.validate_python(rows, from_attributes=True))
+    )
+    return await analytics_cache.store(key, response)
 
 
-@router.get("/analytics/exercises")
+@router.get("/analytics/exercises", response_model=ExerciseListOut)
 async def analytics_list_exercises(
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    # Return distinct exercise names, with a stable "exercise_key" = name for now,
-    # plus an example id from the most recent finished session.
+    key, cached = await analytics_cache.lookup(user.id, "exercises")
+    if cached is not None:
+        return cached
+
+    # Return the user's catalog exercises with history, plus an example id
+    # from the most recent finished session.
     res = await db.execute(
         select(
-            WorkoutExercise.name.label("name"),
-            func.max(WorkoutExercise.id).label("exercise_id"),
-        )
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
-        .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
+            Exercise.name.label("name"),
+            UserExerciseStats.last_workout_exercise_id.label("exercise_id"),
         )
-        .group_by(WorkoutExercise.name)
-        .order_by(WorkoutExercise.name.asc())
+        .join(Exercise, UserExerciseStats.exercise_id == Exercise.id)
+        .where(UserExerciseStats.user_id == user.id)
+        .order_by(Exercise.name.asc())
     )
 
-    return {
-        "items": [
-            {"id": int(r.exercise_id), "name": r.name}
-            for r in res.all()
-            if r.exercise_id is not None
-        ]
-    }
+    response = FastJSONResponse(
+        ExerciseListOut(
+            items=[ExerciseRefOut(id=r.exercise_id, name=r.name) for r in res.all() if r.exercise_id is not None]
+        )
+    )
+    return await analytics_cache.store(key, response)
 
 
-@router.get("/analytics/exercise/{exercise_id}/timeline")
+@router.get("/analytics/exercise/{exercise_id}/timeline", response_model=ExerciseTimelineByIdOut)
 async def analytics_exercise_timeline_by_id(
     exercise_id: int,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    key, cached = await analytics_cache.lookup(user.id, "timeline-by-id", exercise_id)
+    if cached is not None:
+        return cached
+
     # First, confirm this exercise id belongs to the user (finished sessions only)
     chk = await db.execute(
-        select(WorkoutExercise)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
-        .where(
+        select(WorkoutExercise).where(
             WorkoutExercise.id == exercise_id,
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
+            WorkoutExercise.user_id == user.id,
+            WorkoutExercise.performed_at.isnot(None),
         )
     )
     ex = chk.scalar_one_or_none()
     if not ex:
-        return {"found": False, "detail": "Exercise not found"}
+        return FastJSONResponse(ExerciseTimelineByIdOut(found=False, detail="Exercise not found"))
 
-    # Timeline: per finished session, max weight for this exercise name
+    # Timeline: per finished session, max weight for this catalog exercise
     res = await db.execute(
         select(
-            WorkoutSession.ended_at.label("date"),
-            func.max(WorkoutSet.weight_kg).label("max_weight"),
+            ExerciseSessionSummary.ended_at.label("date"),
+            ExerciseSessionSummary.top_weight_kg.label("weight_kg"),
         )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutExercise.name == ex.name,  # group by name for consistent history
-            WorkoutSet.weight_kg.isnot(None),
-            WorkoutSession.ended_at.isnot(None),
+            ExerciseSessionSummary.user_id == user.id,
+            ExerciseSessionSummary.exercise_id == ex.exercise_id,  # whole history, not just this row
+            ExerciseSessionSummary.top_weight_kg.isnot(None),
         )
-        .group_by(WorkoutSession.id)
-        .order_by(WorkoutSession.ended_at.asc())
+        .order_by(ExerciseSessionSummary.ended_at.asc())
     )
 
     rows = res.all()
 
-    return {
-        "found": True,
-        "exercise": {"id": ex.id, "name": ex.name},
-        "points": [{"date": r.date, "weight_kg": float(r.max_weight)} for r in rows],
-    }
+    response = FastJSONResponse(
+        ExerciseTimelineByIdOut(
+            found=True,
+            exercise=ExerciseRefOut.model_validate(ex),
+            points=_timeline_points.validate_python(rows, from_attributes=True),
+        )
+    )
+    return await analytics_cache.store(key, response)
 
 
-@router.get("/analytics/exercise/{exercise_id}/weekly")
+@router.get("/analytics/exercise/{exercise_id}/weekly", response_model=ExerciseWeeklyMaxOut)
 async def analytics_exercise_weekly_max_weight(
     exercise_id: int,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    key, cached = await analytics_cache.lookup(user.id, "weekly-max", exercise_id)
+    if cached is not None:
+        return cached
+
     # Confirm this exercise belongs to the user (finished sessions)
     chk = await db.execute(
-        select(WorkoutExercise)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
-        .where(
+        select(WorkoutExercise).where(
             WorkoutExercise.id == exercise_id,
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
+            WorkoutExercise.user_id == user.id,
+            WorkoutExercise.performed_at.isnot(None),
         )
     )
     ex = chk.scalar_one_or_none()
     if not ex:
-        return {"found": False, "detail": "Exercise not found"}
+        return FastJSONResponse(ExerciseWeeklyMaxOut(found=False, detail="Exercise not found"))
 
-    # SQLite: week bucket = Monday of that week (approx using 'weekday 1')
-    # We group by week_start and take max weight that week.
+    # Group by week (starting Monday) and take max weight that week.
+    week_start = week_bucket(ExerciseSessionSummary.ended_at)
     res = await db.execute(
         select(
-            func.date(WorkoutSession.ended_at, "-6 days", "weekday 1").label("week_start"),
-            func.max(WorkoutSet.weight_kg).label("max_weight"),
+            week_start.label("week_start"),
+            func.max(ExerciseSessionSummary.top_weight_kg).label("weight_kg"),
         )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutExercise.name == ex.name,  # keep history consistent even if ids differ
-            WorkoutSet.weight_kg.isnot(None),
-            WorkoutSession.ended_at.isnot(None),
+            ExerciseSessionSummary.user_id == user.id,
+            ExerciseSessionSummary.exercise_id == ex.exercise_id,  # whole history, not just this row
+            ExerciseSessionSummary.top_weight_kg.isnot(None),
         )
-        .group_by(func.date(WorkoutSession.ended_at, "-6 days", "weekday 1"))
-        .order_by(func.date(WorkoutSession.ended_at, "-6 days", "weekday 1").asc())
+        .group_by(week_start)
+        .order_by(week_start.asc())
     )
 
     rows = res.all()
 
-    return {
-        "found": True,
-        "exercise": {"id": ex.id, "name": ex.name},
-        "points": [
-            {"week_start": r.week_start, "weight_kg": float(r.max_weight)}
-            for r in rows
-            if r.week_start is not None and r.max_weight is not None
-        ],
-    }
+    points = [r for r in rows if r.week_start is not None and r.weight_kg is not None]
+    response = FastJSONResponse(
+        ExerciseWeeklyMaxOut(
+            found=True,
+            exercise=ExerciseRefOut.model_validate(ex),
+            points=_weekly_max_points.validate_python(points, from_attributes=True),
+        )
+    )
+    return await analytics_cache.store(key, response)
 
 
-@router.get("/analytics/exercise/{exercise_id}/weekly-volume")
+@router.get("/analytics/exercise/{exercise_id}/weekly-volume", response_model=ExerciseWeeklyVolumeOut)
 async def analytics_exercise_weekly_volume(
     exercise_id: int,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    key, cached = await analytics_cache.lookup(user.id, "weekly-volume", exercise_id)
+    if cached is not None:
+        return cached
+
     # Confirm exercise belongs to user (finished sessions)
     chk = await db.execute(
-        select(WorkoutExercise)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
-        .where(
+        select(WorkoutExercise).where(
             WorkoutExercise.id == exercise_id,
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
+            WorkoutExercise.user_id == user.id,
+            WorkoutExercise.performed_at.isnot(None),
         )
     )
     ex = chk.scalar_one_or_none()
     if not ex:
-        return {"found": False, "detail": "Exercise not found"}
-
-    # Compute week bucket once and filter out NULL buckets (prevents SQLite date() weirdness -> 500)
-    week_bucket = func.date(WorkoutSession.ended_at, "-6 days", "weekday 1")
+        return FastJSONResponse(ExerciseWeeklyVolumeOut(found=False, detail="Exercise not found"))
 
+    week_start = week_bucket(ExerciseSessionSummary.ended_at)
     res = await db.execute(
         select(
-            week_bucket.label("week_start"),
-            func.sum(
-                func.coalesce(WorkoutSet.weight_kg, 0) * func.coalesce(WorkoutSet.reps, 0)
-            ).label("volume"),
-            func.sum(func.coalesce(WorkoutSet.reps, 0)).label("total_reps"),
-            func.count(WorkoutSet.id).label("sets"),
+            week_start.label("week_start"),
+            func.sum(ExerciseSessionSummary.volume).label("volume"),
+            func.sum(ExerciseSessionSummary.total_reps).label("total_reps"),
+            func.sum(ExerciseSessionSummary.sets).label("sets"),
         )
-        .select_from(WorkoutSet)
-        .join(WorkoutExercise, WorkoutSet.exercise_id == WorkoutExercise.id)
-        .join(WorkoutSession, WorkoutExercise.session_id == WorkoutSession.id)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutExercise.name == ex.name,
-            WorkoutSession.ended_at.isnot(None),
-            week_bucket.isnot(None),  # ✅ KEY FIX
+            ExerciseSessionSummary.user_id == user.id,
+            ExerciseSessionSummary.exercise_id == ex.exercise_id,
         )
-        .group_by(week_bucket)
-        .order_by(week_bucket.asc())
+        .group_by(week_start)
+        .order_by(week_start.asc())
     )
 
     rows = res.all()
 
-    return {
-        "found": True,
-        "exercise": {"id": ex.id, "name": ex.name},
-        "points": [
-            {
-                "week_start": r.week_start,
-                "volume": float(r.volume or 0),
-                "total_reps": int(r.total_reps or 0),
-                "sets": int(r.sets or 0),
-            }
-            for r in rows
-            if r.week_start is not None
-        ],
-    }
+    points = [r for r in rows if r.week_start is not None]
+    response = FastJSONResponse(
+        ExerciseWeeklyVolumeOut(
+            found=True,
+            exercise=ExerciseRefOut.model_validate(ex),
+            points=_weekly_volume_points.validate_python(points, from_attributes=True),
+        )
+    )
+    return await analytics_cache.store(key, response)
 
 
 
-@router.get("/history")
+@router.get("/history", response_model=HistoryOut)
 async def workout_history(
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
     date: str | None = None,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    """
+    Pass the previous response's `next_cursor` as `cursor` to get the next
+    page; it seeks straight to the position instead of skipping `offset`
+    rows. `offset` still works (and is ignored when a cursor is given).
+    """
     limit = max(1, min(limit, 100))
 
     stmt = (
-        select(WorkoutSession)
+        select(
+            WorkoutSession.id,
+            WorkoutSession.title,
+            WorkoutSession.notes,
+            WorkoutSession.started_at,
+            WorkoutSession.ended_at,
+        )
         .where(
             WorkoutSession.user_id == user.id,
             WorkoutSession.status == "finished",
         )
         .order_by(WorkoutSession.ended_at.desc(), WorkoutSession.id.desc())
-        .limit(limit)
-        .offset(offset)
+        .limit(limit + 1)  # one extra row tells us whether there is a next page
     )
 
+    if cursor:
+        after_ended_at, after_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(WorkoutSession.ended_at, WorkoutSession.id) < tuple_(after_ended_at, after_id)
+        )
+    else:
+        stmt = stmt.offset(offset)
+
     if date:
-        d = datetime.strptime(date, "%Y-%m-%d").date()
-        stmt = stmt.where(func.date(WorkoutSession.ended_at) == d)
+        day_start, day_end = day_range(datetime.strptime(date, "%Y-%m-%d").date())
+        stmt = stmt.where(
+            WorkoutSession.ended_at >= day_start,
+            WorkoutSession.ended_at < day_end,
+        )
 
     res = await db.execute(stmt)
-    sessions = res.scalars().all()
-
-    return {
-        "items": [
-            {
-                "id": s.id,
-                "title": s.title,
-                "notes": s.notes,
-                "started_at": s.started_at,
-                "ended_at": s.ended_at,
-            }
-            for s in sessions
-        ],
-        "limit": limit,
-        "offset": offset,
-    }
+    sessions = res.all()
+
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = encode_cursor(sessions[-1].ended_at, sessions[-1].id)
+
+    return FastJSONResponse(
+        HistoryOut(
+            items=_history_items.validate_python(sessions, from_attributes=True),
+            limit=limit,
+            offset=offset,
+            next_cursor=next_cursor,
+        )
+    )
 
 
-@router.get("/session/{session_id}")
+@router.get("/session/{session_id}", response_model=SessionDetailOut)
 async def get_session_full_by_id(
     session_id: int,
-    user: User = Depends(get_current_user),
+    if_none_match: str | None = Header(default=None),
+    user: Principal = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ):
-    print(f"=== GET SESSION BY ID: {session_id} ===")
-    
     # Session must belong to user
     res = await db.execute(
         select(WorkoutSession).where(
@@ -1234,77 +1101,25 @@ async def get_session_full_by_id(
     )
     session = res.scalar_one_or_none()
     if not session:
-        return {"found": False, "detail": "Session not found"}
+        return FastJSONResponse(SessionDetailOut(found=False, detail="Session not found"))
 
-    # Exercises in session
-    ex_res = await db.execute(
-        select(WorkoutExercise)
-        .where(WorkoutExercise.session_id == session.id)
-        .order_by(WorkoutExercise.order_index.asc(), WorkoutExercise.id.asc())
-    )
-    exercises = ex_res.scalars().all()
-    ex_ids = [e.id for e in exercises]
-    print(f"Found {len(exercises)} exercises")
+    etag = _session_etag(session)
+    cache_control = long_lived() if session.status == "finished" else REVALIDATE
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, cache_control)
 
-    sets_by_ex: dict[int, list[WorkoutSet]] = {eid: [] for eid in ex_ids}
-    if ex_ids:
-        set_res = await db.execute(
-            select(WorkoutSet)
-            .where(WorkoutSet.exercise_id.in_(ex_ids))
-            .order_by(WorkoutSet.exercise_id.asc(), WorkoutSet.set_number.asc(), WorkoutSet.id.asc())
-        )
-        sets = set_res.scalars().all()
-        print(f"Found {len(sets)} total sets")
-        for s in sets:
-            print(f"  Set: exercise_id={s.exercise_id}, set_number={s.set_number}, reps={s.reps}, weight={s.weight_kg}")
-            sets_by_ex[s.exercise_id].append(s)
-
-    result = {
-        "found": True,
-        "session": {
-            "id": session.id,
-            "status": session.status,
-            "title": session.title,
-            "notes": session.notes,
-            "started_at": session.started_at,
-            "ended_at": session.ended_at,
-            "exercises": [
-                {
-                    "id": e.id,
-                    "name": e.name,
-                    "order_index": e.order_index,
-                    "sets": [
-                        {
-                            "id": s.id,
-                            "set_number": s.set_number,
-                            "reps": s.reps,
-                            "weight_kg": s.weight_kg,
-                            "created_at": s.created_at,
-                        }
-                        for s in sets_by_ex.get(e.id, [])
-                    ],
-                }
-                for e in exercises
-            ],
-        },
-    }
-    
-    print(f"Returning {len(result['session']['exercises'])} exercises in response")
-    for ex in result['session']['exercises']:
-        print(f"  Exercise {ex['name']}: {len(ex['sets'])} sets")
-    
-    print("=== GET SESSION COMPLETE ===")
-    return result
+    return FastJSONResponse(
+        SessionDetailOut(found=True, session=await _session_tree(db, session)),
+        headers=cache_headers(etag, cache_control),
+    )
 
 
-@router.post("/templates/from-active")
+@router.post("/templates/from-active", response_model=TemplateFromActiveOut)
 async def create_template_from_active(
     payload: CreateTemplateFromActiveIn,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    print(f"=== CREATE TEMPLATE FROM ACTIVE CALLED - User: {user.id}, Name: {payload.name} ===")
-    
     # Get active session
     res = await db.execute(
         select(WorkoutSession).where(
@@ -1314,125 +1129,68 @@ async def create_template_from_active(
     )
     session = res.scalar_one_or_none()
     if not session:
-        return {"created": False, "detail": "No active session"}
+        return FastJSONResponse(TemplateFromActiveOut(created=False, detail="No active session"))
 
-    # Create template
+    # Create template and copy the session's exercises and sets into it
     template = WorkoutTemplate(
         user_id=user.id,
         name=payload.name,
         description=payload.description,
     )
     db.add(template)
+    await db.flush()
+    copied = await copy_session_into_template(db, session.id, template.id)
     await db.commit()
-    await db.refresh(template)
-    print(f"Template created: ID={template.id}")
+    logger.info("created template %d from session %d (%d exercises)", template.id, session.id, copied)
 
-    # Get exercises in session
-    ex_res = await db.execute(
-        select(WorkoutExercise)
-        .where(WorkoutExercise.session_id == session.id)
-        .order_by(WorkoutExercise.order_index.asc(), WorkoutExercise.id.asc())
-    )
-    exercises = ex_res.scalars().all()
-    print(f"Found {len(exercises)} exercises in session")
-
-    for ex in exercises:
-        print(f"Processing exercise: {ex.name} (ID={ex.id})")
-        
-        # Create template exercise
-        tex = WorkoutTemplateExercise(
-            template_id=template.id,
-            name=ex.name,
-            order_index=ex.order_index,
-        )
-        db.add(tex)
-        await db.commit()
-        await db.refresh(tex)
-        print(f"  Template exercise created: ID={tex.id}")
+    return FastJSONResponse(TemplateFromActiveOut(created=True, template=TemplateSummaryOut.model_validate(template)))
 
-        # Copy sets into template sets
-        set_res = await db.execute(
-            select(WorkoutSet)
-            .where(WorkoutSet.exercise_id == ex.id)
-            .order_by(WorkoutSet.set_number.asc(), WorkoutSet.id.asc())
-        )
-        sets = set_res.scalars().all()
-        print(f"  Found {len(sets)} sets for this exercise")
-
-        for s in sets:
-            print(f"    Creating set: set_number={s.set_number}, reps={s.reps}, weight={s.weight_kg}")
-            ts = WorkoutTemplateSet(
-                template_exercise_id=tex.id,
-                set_number=s.set_number,
-                reps=s.reps,
-                weight_kg=s.weight_kg,
-            )
-            db.add(ts)
 
-    await db.commit()
-    print("=== TEMPLATE CREATION COMPLETE ===")
 
-    return {
-        "created": True,
-        "template": {
-            "id": template.id,
-            "name": template.name,
-            "description": template.description,
-        },
-    }
-
-
-
-@router.get("/calendar/month")
+@router.get("/calendar/month", response_model=CalendarMonthOut)
 async def workout_calendar_month(
     year: int,
     month: int,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    if_none_match: str | None = Header(default=None),
+    user: Principal = Depends(get_token_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Returns the days of the given month that have at least one finished workout.
     Example: /workouts/calendar/month?year=2026&month=1
     """
-    from datetime import datetime, timezone
-    from calendar import monthrange
-
     if month < 1 or month > 12:
-        return {"detail": "month must be 1-12"}
+        return FastJSONResponse(CalendarMonthOut(detail="month must be 1-12"))
 
-    days_in_month = monthrange(year, month)[1]
-    start_dt = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
-    end_dt = datetime(year, month, days_in_month, 23, 59, 59, tzinfo=timezone.utc)
+    start_dt, end_dt = month_range(year, month)
 
     res = await db.execute(
-        select(func.date(WorkoutSession.ended_at).label("d"))
+        select(WorkoutDailyStats.day)
         .where(
-            WorkoutSession.user_id == user.id,
-            WorkoutSession.status == "finished",
-            WorkoutSession.ended_at.isnot(None),
-            WorkoutSession.ended_at >= start_dt,
-            WorkoutSession.ended_at <= end_dt,
+            WorkoutDailyStats.user_id == user.id,
+            WorkoutDailyStats.day >= start_dt.date(),
+            WorkoutDailyStats.day < end_dt.date(),
+            WorkoutDailyStats.sessions > 0,
         )
-        .group_by(func.date(WorkoutSession.ended_at))
-        .order_by(func.date(WorkoutSession.ended_at).asc())
+        .order_by(WorkoutDailyStats.day.asc())
     )
 
-    rows = res.all()
-    # rows contain strings like "2026-01-23"
-    days = []
-    for r in rows:
-        try:
-            days.append(int(str(r.d)[8:10]))
-        except Exception:
-            pass
+    days = [d.day for d in res.scalars().all()]
 
-    return {"year": year, "month": month, "days": days}
+    etag = make_etag("calendar", user.id, year, month, days)
+    cache_control = long_lived() if end_dt <= utc_now() else REVALIDATE
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, cache_control)
+
+    return FastJSONResponse(
+        CalendarMonthOut(year=year, month=month, days=days), headers=cache_headers(etag, cache_control)
+    )
 
 
-@router.delete("/session/exercise/{exercise_id}")
+@router.delete("/session/exercise/{exercise_id}", response_model=DeletedOut)
 async def delete_exercise(
     exercise_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Verify exercise belongs to user's active session
@@ -1447,16 +1205,17 @@ async def delete_exercise(
     )
     exercise = res.scalar_one_or_none()
     if not exercise:
-        return {"deleted": False, "detail": "Exercise not found or no active session"}
+        return FastJSONResponse(DeletedOut(deleted=False, detail="Exercise not found or no active session"))
 
     await db.delete(exercise)
+    await _touch_sessions(db, WorkoutSession.id == exercise.session_id)
     await db.commit()
 
-    return {"deleted": True, "exercise_id": exercise_id}
+    return FastJSONResponse(DeletedOut(deleted=True, exercise_id=exercise_id))
 
-@router.delete("/purge-workouts")
+@router.delete("/purge-workouts", response_model=PurgeWorkoutsOut)
 async def purge_all_workouts(
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -1473,7 +1232,9 @@ async def purge_all_workouts(
     session_ids = [r[0] for r in res.all()]
 
     if not session_ids:
-        return {"deleted": 0}
+        return FastJSONResponse(PurgeWorkoutsOut(deleted=0))
+
+    await workout_stats.clear_user(db, user.id)
 
     # Delete sets
     await db.execute(
@@ -1501,13 +1262,14 @@ async def purge_all_workouts(
     )
 
     await db.commit()
+    await analytics_cache.invalidate_user(user.id)
 
-    return {"deleted_sessions": len(session_ids)}
+    return FastJSONResponse(PurgeWorkoutsOut(deleted_sessions=len(session_ids)))
 
-@router.delete("/session/{session_id}")
+@router.delete("/session/{session_id}", response_model=DeletedOut)
 async def delete_session(
     session_id: int,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Ensure session belongs to current user
@@ -1519,7 +1281,7 @@ async def delete_session(
     )
     sess = res.scalar_one_or_none()
     if not sess:
-        return {"deleted": False, "detail": "Session not found"}
+        return FastJSONResponse(DeletedOut(deleted=False, detail="Session not found"))
 
     # Delete sets -> exercises -> session (safe for SQLite)
     ex_ids_res = await db.execute(
@@ -1527,24 +1289,28 @@ async def delete_session(
     )
     ex_ids = [r[0] for r in ex_ids_res.all()]
 
+    if sess.status == "finished":
+        await workout_stats.remove_sessions(db, user.id, [session_id])
     if ex_ids:
         await db.execute(delete(WorkoutSet).where(WorkoutSet.exercise_id.in_(ex_ids)))
         await db.execute(delete(WorkoutExercise).where(WorkoutExercise.id.in_(ex_ids)))
 
     await db.execute(delete(WorkoutSession).where(WorkoutSession.id == session_id))
     await db.commit()
+    if sess.status == "finished":
+        await analytics_cache.invalidate_user(user.id)
 
-    return {"deleted": True, "session_id": session_id}
+    return FastJSONResponse(DeletedOut(deleted=True, session_id=session_id))
 
-@router.delete("/exercise/{exercise_name}/purge")
+@router.delete("/exercise/{exercise_name}/purge", response_model=PurgeExerciseOut)
 async def purge_exercise_history(
     exercise_name: str,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     name_norm = exercise_name.strip().lower()
     if not name_norm:
-        return {"deleted_exercises": 0, "deleted_sets": 0}
+        return FastJSONResponse(PurgeExerciseOut(deleted_exercises=0, deleted_sets=0))
 
     # Find ALL workout_exercises for this user matching the name (case-insensitive)
     ex_ids_res = await db.execute(
@@ -1558,18 +1324,28 @@ async def purge_exercise_history(
     ex_ids = [r[0] for r in ex_ids_res.all()]
 
     if not ex_ids:
-        return {"deleted_exercises": 0, "deleted_sets": 0, "detail": "No matching exercises found"}
+        return FastJSONResponse(
+            PurgeExerciseOut(deleted_exercises=0, deleted_sets=0, detail="No matching exercises found")
+        )
 
+    await _touch_sessions(
+        db,
+        WorkoutSession.id.in_(select(WorkoutExercise.session_id).where(WorkoutExercise.id.in_(ex_ids))),
+    )
+    await workout_stats.remove_exercises(db, user.id, ex_ids)
     # Delete sets first
     sets_del = await db.execute(delete(WorkoutSet).where(WorkoutSet.exercise_id.in_(ex_ids)))
     # Delete exercises
     ex_del = await db.execute(delete(WorkoutExercise).where(WorkoutExercise.id.in_(ex_ids)))
 
     await db.commit()
+    await analytics_cache.invalidate_user(user.id)
 
-    return {
-        "exercise": exercise_name,
-        "deleted_exercises": ex_del.rowcount or 0,
-        "deleted_sets": sets_del.rowcount or 0,
-    }
+    return FastJSONResponse(
+        PurgeExerciseOut(
+            exercise=exercise_name,
+            deleted_exercises=ex_del.rowcount or 0,
+            deleted_sets=sets_del.rowcount or 0,
+        )
+    )
 
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class FoodEntryCreate(BaseModel):
     date: date
@@ -11,6 +11,8 @@ class FoodEntryCreate(BaseModel):
     fat_g: float = Field(ge=0)
 
 class FoodEntryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     date: date
     date_time: datetime
@@ -54,3 +56,26 @@ class Last7DaysOut(BaseModel):
     start_date: date
     end_date: date
     items: list[DayMacroTotals]
+
+class RangeBucketOut(BaseModel):
+    start: date
+    # Calendar days of the bucket inside the requested range, and how many have entries
+    days: int
+    logged_days: int
+    calories: int
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+    # Per logged day, so unlogged days don't drag the average down
+    avg_calories: float
+    avg_protein_g: float
+    avg_carbs_g: float
+    avg_fat_g: float
+
+class NutritionRangeOut(BaseModel):
+    start: date
+    end: date
+    granularity: str
+    items: list[RangeBucketOut]
+    # The whole range as one bucket
+    summary: RangeBucketOut
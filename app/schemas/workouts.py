@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from datetime import date, datetime
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 class StartSessionIn(BaseModel):
@@ -29,3 +30,272 @@ class AddTemplateExerciseIn(BaseModel):
 class CreateTemplateFromActiveIn(BaseModel):
     name: str
     description: str | None = None
+
+class TemplateSetIn(BaseModel):
+    id: int | None = None
+    set_number: int
+    target_reps: int | None = None
+    target_weight_kg: float | None = None
+
+class TemplateExerciseIn(BaseModel):
+    id: int | None = None
+    name: str
+    order_index: int | None = 0
+    sets: list[TemplateSetIn] = []
+
+class UpdateTemplateIn(BaseModel):
+    name: str | None = None
+    description: str | None = None
+    # Full desired tree; omit to leave exercises untouched
+    exercises: list[TemplateExerciseIn] | None = None
+
+# --- Response schemas ---
+# Envelopes are rendered with exclude_unset (see FastJSONResponse), so the
+# optional fields only appear when a handler sets them.
+
+class _FromAttributes(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+class SessionOut(_FromAttributes):
+    id: int
+    status: str
+    started_at: datetime
+    ended_at: datetime | None
+    title: str | None
+    notes: str | None
+
+class ActiveSessionOut(BaseModel):
+    active: bool
+    session: SessionOut | None
+
+class FinishedSessionOut(_FromAttributes):
+    id: int
+    source_template_id: int | None
+    status: str
+    started_at: datetime
+    ended_at: datetime | None
+
+class SessionSummaryOut(BaseModel):
+    exercises_count: int
+    total_sets: int
+    total_volume: float
+    duration_seconds: int | None
+
+class FinishSessionOut(BaseModel):
+    finished: bool
+    detail: str | None = None
+    session: FinishedSessionOut | None = None
+    summary: SessionSummaryOut | None = None
+
+class SessionExerciseOut(_FromAttributes):
+    id: int
+    session_id: int
+    name: str
+    order_index: int
+
+class AddExerciseOut(BaseModel):
+    created: bool
+    detail: str | None = None
+    exercise: SessionExerciseOut | None = None
+
+class SetOut(_FromAttributes):
+    id: int
+    exercise_id: int
+    set_number: int
+    reps: int | None
+    weight_kg: float | None
+
+class AddSetOut(BaseModel):
+    created: bool
+    detail: str | None = None
+    set: SetOut | None = None
+
+class UpdateSetOut(BaseModel):
+    updated: bool
+    detail: str | None = None
+    set: SetOut | None = None
+
+class DeletedOut(BaseModel):
+    deleted: bool
+    detail: str | None = None
+    session_id: int | None = None
+    exercise_id: int | None = None
+    set_id: int | None = None
+    template_id: int | None = None
+
+class SessionSetOut(_FromAttributes):
+    id: int
+    set_number: int
+    reps: int | None
+    weight_kg: float | None
+    created_at: datetime
+
+class SessionExerciseTreeOut(_FromAttributes):
+    id: int
+    name: str
+    order_index: int
+    sets: list[SessionSetOut]
+
+class SessionTreeOut(SessionOut):
+    exercises: list[SessionExerciseTreeOut]
+
+class ActiveSessionFullOut(BaseModel):
+    active: bool
+    session: SessionTreeOut | None
+
+class SessionDetailOut(BaseModel):
+    found: bool
+    detail: str | None = None
+    session: SessionTreeOut | None = None
+
+class TemplateOut(_FromAttributes):
+    id: int
+    name: str
+    description: str | None
+    created_at: datetime
+
+class TemplateListOut(BaseModel):
+    items: list[TemplateOut]
+
+class CreateTemplateOut(BaseModel):
+    created: bool
+    template: TemplateOut
+
+class TemplateSummaryOut(_FromAttributes):
+    id: int
+    name: str
+    description: str | None
+
+class UpdateTemplateOut(BaseModel):
+    updated: bool
+    detail: str | None = None
+    template: TemplateSummaryOut | None = None
+
+class TemplateFromActiveOut(BaseModel):
+    created: bool
+    detail: str | None = None
+    template: TemplateSummaryOut | None = None
+
+class TemplateExerciseOut(_FromAttributes):
+    id: int
+    template_id: int
+    name: str
+    order_index: int
+
+class AddTemplateExerciseOut(BaseModel):
+    created: bool
+    detail: str | None = None
+    exercise: TemplateExerciseOut | None = None
+
+class StartedSessionOut(_FromAttributes):
+    id: int
+    title: str | None
+    notes: str | None
+
+class StartFromTemplateOut(BaseModel):
+    started: bool
+    detail: str | None = None
+    session: StartedSessionOut | None = None
+
+class HistoryItemOut(_FromAttributes):
+    id: int
+    title: str | None
+    notes: str | None
+    started_at: datetime
+    ended_at: datetime | None
+
+class HistoryOut(BaseModel):
+    items: list[HistoryItemOut]
+    limit: int
+    offset: int
+    next_cursor: str | None
+
+class CalendarMonthOut(BaseModel):
+    detail: str | None = None
+    year: int | None = None
+    month: int | None = None
+    days: list[int] | None = None
+
+class PurgeWorkoutsOut(BaseModel):
+    deleted: int | None = None
+    deleted_sessions: int | None = None
+
+class PurgeExerciseOut(BaseModel):
+    exercise: str | None = None
+    deleted_exercises: int
+    deleted_sets: int
+    detail: str | None = None
+
+# --- Analytics response schemas ---
+
+class ExerciseVolumeOut(_FromAttributes):
+    exercise: str
+    volume: float
+    sets: int
+
+class WeeklyReviewOut(BaseModel):
+    range: str
+    sessions_count: int
+    total_sets: int
+    total_reps: int
+    total_volume: float
+    prs_count: int
+    top_exercises_by_volume: list[ExerciseVolumeOut]
+
+class VolumeOut(BaseModel):
+    range: str
+    items: list[ExerciseVolumeOut]
+
+class PersonalBestOut(_FromAttributes):
+    exercise: str
+    weight_kg: float
+    reps: int | None
+    date: datetime
+    # Epley estimate over all sets, not necessarily the heaviest one
+    best_e1rm_kg: float | None = None
+
+class PersonalBestsOut(BaseModel):
+    items: list[PersonalBestOut]
+
+class ExerciseRefOut(_FromAttributes):
+    id: int
+    name: str
+
+class ExerciseListOut(BaseModel):
+    items: list[ExerciseRefOut]
+
+class TimelinePointOut(_FromAttributes):
+    date: datetime
+    weight_kg: float
+
+class ExerciseTimelineOut(BaseModel):
+    exercise: str
+    points: list[TimelinePointOut]
+
+class ExerciseTimelineByIdOut(BaseModel):
+    found: bool
+    detail: str | None = None
+    exercise: ExerciseRefOut | None = None
+    points: list[TimelinePointOut] | None = None
+
+class WeeklyMaxPointOut(_FromAttributes):
+    week_start: date
+    weight_kg: float
+
+class ExerciseWeeklyMaxOut(BaseModel):
+    found: bool
+    detail: str | None = None
+    exercise: ExerciseRefOut | None = None
+    points: list[WeeklyMaxPointOut] | None = None
+
+class WeeklyVolumePointOut(_FromAttributes):
+    week_start: date
+    volume: float
+    total_reps: int
+    sets: int
+
+class ExerciseWeeklyVolumeOut(BaseModel):
+    found: bool
+    detail: str | None = None
+    exercise: ExerciseRefOut | None = None
+    points: list[WeeklyVolumePointOut] | None = None
@@ -0,0 +1,85 @@
+"""denormalize user and performed_at onto exercises and sets
+
+Revision ID: e9f96b24e09e
+Revises: 6310a9b6f63a
+Create Date: 2026-10-17 00:26:41.493985
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9f96b24e09e'
+down_revision: Union[str, Sequence[str], None] = '6310a9b6f63a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Add nullable, backfill from the owning session, then tighten (batch mode for SQLite).
+    # Batch mode can't reflect expression indexes, so lower(name) is rebuilt afterwards.
+    op.drop_index('ix_workout_exercises_lower_name', table_name='workout_exercises')
+    with op.batch_alter_table('workout_exercises', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('performed_at', sa.DateTime(timezone=True), nullable=True))
+    with op.batch_alter_table('workout_sets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('performed_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute(
+        """
+        UPDATE workout_exercises
+        SET user_id = (
+                SELECT s.user_id FROM workout_sessions s WHERE s.id = workout_exercises.session_id
+            ),
+            performed_at = (
+                SELECT s.ended_at FROM workout_sessions s
+                WHERE s.id = workout_exercises.session_id AND s.status = 'finished'
+            )
+        """
+    )
+    op.execute(
+        """
+        UPDATE workout_sets
+        SET user_id = (
+                SELECT e.user_id FROM workout_exercises e WHERE e.id = workout_sets.exercise_id
+            ),
+            performed_at = (
+                SELECT e.performed_at FROM workout_exercises e WHERE e.id = workout_sets.exercise_id
+            )
+        """
+    )
+
+    with op.batch_alter_table('workout_exercises', schema=None) as batch_op:
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index('ix_workout_exercises_user_performed', ['user_id', 'performed_at'], unique=False)
+        batch_op.create_foreign_key(
+            'fk_workout_exercises_user_id', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+        )
+    with op.batch_alter_table('workout_sets', schema=None) as batch_op:
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index('ix_workout_sets_user_performed', ['user_id', 'performed_at'], unique=False)
+        batch_op.create_foreign_key(
+            'fk_workout_sets_user_id', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+        )
+    op.create_index('ix_workout_exercises_lower_name', 'workout_exercises', [sa.text('lower(name)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_workout_exercises_lower_name', table_name='workout_exercises')
+    with op.batch_alter_table('workout_sets', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_workout_sets_user_id', type_='foreignkey')
+        batch_op.drop_index('ix_workout_sets_user_performed')
+        batch_op.drop_column('performed_at')
+        batch_op.drop_column('user_id')
+    with op.batch_alter_table('workout_exercises', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_workout_exercises_user_id', type_='foreignkey')
+        batch_op.drop_index('ix_workout_exercises_user_performed')
+        batch_op.drop_column('performed_at')
+        batch_op.drop_column('user_id')
+    op.create_index('ix_workout_exercises_lower_name', 'workout_exercises', [sa.text('lower(name)')], unique=False)